@@ -24,6 +24,38 @@ class Config:
     DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "ollama")
     OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 
+    # Adaptive Backend Policy
+    # Picks LLM backend, Ollama model and Whisper profile per request from CPU/memory/battery readings
+    ADAPTIVE_POLICY = os.getenv("ADAPTIVE_POLICY", "True").lower() == "true"
+    OLLAMA_MODEL_LIGHT = os.getenv("OLLAMA_MODEL_LIGHT", "llama3.2:1b")
+    POLICY_CPU_MID = float(os.getenv("POLICY_CPU_MID", 60))  # percent
+    POLICY_CPU_HIGH = float(os.getenv("POLICY_CPU_HIGH", 85))
+    POLICY_MEM_MID_GB = float(os.getenv("POLICY_MEM_MID_GB", 4))  # free memory
+    POLICY_MEM_LOW_GB = float(os.getenv("POLICY_MEM_LOW_GB", 1.5))
+    POLICY_BATTERY_LOW = float(os.getenv("POLICY_BATTERY_LOW", 20))  # percent, when unplugged
+    POLICY_MIN_DWELL = float(os.getenv("POLICY_MIN_DWELL", 30))  # seconds before moving back up a tier
+
+    # Speech-to-Text
+    # Named decode profile (see tools/voice_io.py WHISPER_PROFILES): 'command', 'dictation' or 'background'
+    WHISPER_PROFILE = os.getenv("WHISPER_PROFILE", "command")
+    # Thread count for profiles that don't set their own; 0 lets CTranslate2 pick
+    WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", 0))
+    # Run Whisper in a separate pre-warmed process so a slow or crashing decode can't stall Bhumi
+    WHISPER_WORKER = os.getenv("WHISPER_WORKER", "True").lower() == "true"
+
+    # Circuit Breakers (ElevenLabs, Gemini, Ollama)
+    # Consecutive failures before a backend is skipped, and its cool-down in seconds (doubles per failed probe)
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", 3))
+    BREAKER_BASE_COOLDOWN = float(os.getenv("BREAKER_BASE_COOLDOWN", 15))
+    BREAKER_MAX_COOLDOWN = float(os.getenv("BREAKER_MAX_COOLDOWN", 600))
+
+    # Deep Search
+    # Pages fetched per query, per-page byte cap and timeout, and the text budget handed to the LLM
+    DEEP_SEARCH_PAGES = int(os.getenv("DEEP_SEARCH_PAGES", 3))
+    DEEP_SEARCH_MAX_BYTES = int(os.getenv("DEEP_SEARCH_MAX_BYTES", 1_000_000))
+    DEEP_SEARCH_TIMEOUT = float(os.getenv("DEEP_SEARCH_TIMEOUT", 5))
+    DEEP_SEARCH_CONTEXT_CHARS = int(os.getenv("DEEP_SEARCH_CONTEXT_CHARS", 6000))
+
     # Interface Mode
     # If True, runs a text-based loop. If False, attempts to load Hotkey/Voice Listener.
     # Defaults to True in this sandbox environment, but user can set to False in .env
@@ -32,10 +64,27 @@ class Config:
     # Paths
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     BUILD_SCRIPTS_DIR = os.path.join(BASE_DIR, "build_scripts")
+    COMMAND_LOG_PATH = os.path.join(BASE_DIR, "command_log.json")
+
+    # Background Prefetch
+    # Learns when email/news are asked for and refreshes them shortly before
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "True").lower() == "true"
+    PREFETCH_LEAD_MINUTES = int(os.getenv("PREFETCH_LEAD_MINUTES", 10))
+    PREFETCH_MIN_INTERVAL = int(os.getenv("PREFETCH_MIN_INTERVAL", 300))  # seconds between refreshes of one tool
+    PREFETCH_MAX_PER_HOUR = int(os.getenv("PREFETCH_MAX_PER_HOUR", 12))
+    PREFETCH_MIN_BATTERY = int(os.getenv("PREFETCH_MIN_BATTERY", 50))  # percent, when unplugged
 
     # Constants
     HOTKEY = os.getenv("WAKE_WORD_HOTKEY", "<ctrl>+<shift>+b")
 
+    # Wake Trigger
+    # 'hotkey' uses the pynput global hotkey, 'wakeword' runs the always-on listener (works headless/over SSH)
+    WAKE_TRIGGER = os.getenv("WAKE_TRIGGER", "hotkey")
+    # Folder of 16 kHz mono WAV recordings of the wake word
+    WAKE_WORD_TEMPLATES_DIR = os.getenv("WAKE_WORD_TEMPLATES_DIR", os.path.join(BASE_DIR, "wake_word"))
+    # Lower is stricter
+    WAKE_WORD_THRESHOLD = float(os.getenv("WAKE_WORD_THRESHOLD", 0.35))
+
     @staticmethod
     def is_windows():
         return Config.OS_NAME == "Windows"
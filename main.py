@@ -8,6 +8,9 @@ from tools.system_ctrl import SystemTools
 from tools.web_search import WebSearch
 from tools.messaging import MessagingTools
 from tools.voice_io import VoiceIO
+from tools.registry import build_default_registry
+from tools.prefetch import PrefetchScheduler
+from tools.resource_policy import ResourcePolicy
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -22,6 +25,12 @@ def main():
     web_tools = WebSearch()
     msg_tools = MessagingTools()
     voice = VoiceIO()
+    registry = build_default_registry(sys_tools, web_tools, msg_tools, brain)
+    if Config.PREFETCH_ENABLED:
+        PrefetchScheduler(registry).start()
+    policy = ResourcePolicy() if Config.ADAPTIVE_POLICY else None
+    if policy:
+        policy.start()
 
     def process_command(user_input=None):
         """
@@ -30,11 +39,16 @@ def main():
         3. Execute tool or generate chat
         4. Speak response
         """
+        # Pick backends for this request from current CPU/memory/battery
+        decision = policy.decide() if policy else None
+        if decision:
+            brain.apply_policy(decision)
+
         # 1. Listen
         if user_input is None:
             # Voice Mode
             logger.info("Listening via VoiceIO...")
-            user_input = voice.listen_chunk()
+            user_input = voice.listen_chunk(profile=decision["whisper_profile"] if decision else None)
             if not user_input or user_input == "Whisper not loaded.":
                 logger.warning("No audio captured or Whisper missing.")
                 return
@@ -52,28 +66,14 @@ def main():
             new_mode = "gemini" if brain.mode == "ollama" else "ollama"
             response_text = brain.switch_mode(new_mode)
 
-        elif "compile" in lower_input and "rom" in lower_input:
-            response_text = sys_tools.compile_rom("haydn_build.sh")
-
-        elif "check health" in lower_input:
-            response_text = sys_tools.check_health()
-
-        elif "search" in lower_input:
-            query = user_input.replace("search", "").strip()
-            response_text = web_tools.search_web(query)
-
-        elif "tech news" in lower_input:
-            response_text = web_tools.fetch_tech_news()
-
-        elif "email" in lower_input:
-            response_text = msg_tools.check_emails()
-
-        elif "whatsapp" in lower_input:
-            response_text = "I need you to implement the detailed parsing for WhatsApp, darling. 😘"
-
         else:
-            # 3. Chat with Brain
-            response_text = brain.chat(user_input)
+            # Compound commands ("check my email and tech news") run their tools concurrently
+            plan = registry.plan(user_input)
+            if plan:
+                response_text = registry.run(plan)
+            else:
+                # 3. Chat with Brain
+                response_text = brain.chat(user_input)
 
         # 4. Speak
         print(f"Bhumi: {response_text}")
@@ -82,25 +82,34 @@ def main():
     # Start Main Loop
     logger.info("Bhumi is ready! Press Ctrl+C to exit.")
 
-    if Config.CLI_MODE:
-        logger.info("Running in CLI Mode. Type your commands.")
-        try:
-            while True:
-                user_input = input("You: ")
-                process_command(user_input)
-        except KeyboardInterrupt:
-            logger.info("Shutting down. Bye handsome! 💋")
-    else:
-        logger.info(f"Running in Voice Mode. Press {Config.HOTKEY} to talk.")
-        # Start Hotkey Listener
-        # Note: listen_chunk in process_command is blocking for duration.
-        # Ideally, hotkey triggers start recording, release stops.
-        # Here we trigger a fixed recording window on keypress.
-        listener = voice.start_hotkey_listener(lambda: process_command(user_input=None))
-        if listener:
-            listener.join()
+    try:
+        if Config.CLI_MODE:
+            logger.info("Running in CLI Mode. Type your commands.")
+            try:
+                while True:
+                    user_input = input("You: ")
+                    process_command(user_input)
+            except KeyboardInterrupt:
+                logger.info("Shutting down. Bye handsome! 💋")
         else:
-            logger.error("Could not start hotkey listener. Exiting.")
+            if Config.WAKE_TRIGGER == "wakeword":
+                logger.info("Running in Voice Mode. Say the wake word to talk.")
+                # Always-on low-CPU listener; Whisper only runs after the wake word is detected.
+                listener = voice.start_wake_word_listener(lambda: process_command(user_input=None))
+            else:
+                logger.info(f"Running in Voice Mode. Press {Config.HOTKEY} to talk.")
+                # Start Hotkey Listener
+                # Note: listen_chunk in process_command is blocking for duration.
+                # Ideally, hotkey triggers start recording, release stops.
+                # Here we trigger a fixed recording window on keypress.
+                listener = voice.start_hotkey_listener(lambda: process_command(user_input=None))
+            if listener:
+                listener.join()
+            else:
+                logger.error(f"Could not start {Config.WAKE_TRIGGER} listener. Exiting.")
+    finally:
+        # Stops the Whisper worker process in both modes, however we got here
+        voice.close()
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,21 @@
 import os
 import json
+import time
 import logging
 from abc import ABC, abstractmethod
 import google.generativeai as genai
 import ollama
 from config import Config
+from tools.circuit_breaker import CircuitBreaker
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# How long (seconds) the list of pulled Ollama models is trusted, and how long to wait after a failed listing
+MODEL_LIST_TTL = 300
+MODEL_LIST_RETRY = 60
+
 # Persona Definition
 BHUMI_PERSONA = """
 You are Bhumi, a female, flirty, high-energy, and slightly naughty AI companion.
@@ -23,15 +29,85 @@ When answering questions or performing tasks, maintain your persona:
 """
 
 class LLMBackend(ABC):
-    @abstractmethod
+    name = "LLM"
+    error_message = "My brain glitched, give me a sec. 😵"
+
+    def __init__(self):
+        # Once the backend is known to be down, generate() returns the error message without trying
+        self.breaker = CircuitBreaker(self.name)
+
     def generate(self, prompt: str, history: list) -> str:
+        if not self.breaker.allow():
+            return self.error_message
+
+        try:
+            response_text = self._generate(prompt, history)
+        except Exception as e:
+            self.breaker.record_failure()
+            logger.error(f"{self.name} Error: {e}")
+            return self.error_message
+
+        self.breaker.record_success()
+        return response_text
+
+    @abstractmethod
+    def _generate(self, prompt: str, history: list) -> str:
         pass
 
 class OllamaBackend(LLMBackend):
-    def __init__(self, model_name: str):
+    name = "Ollama"
+    error_message = "Opps, my local brain hurts. Check if Ollama is running, darling! 💔"
+
+    def __init__(self, model_name: str, clock=time.monotonic):
+        super().__init__()
         self.model_name = model_name
+        self.default_model = model_name # What we fall back to if a swapped-in model isn't pulled
+        self.clock = clock
+        self.installed = None # Model names from ollama.list(), fetched on first use
+        self.listed_at = None
+        self.list_failed_at = None
+        self.missing_models = set() # Already warned about
+
+    def refresh_models(self):
+        """
+        Re-reads the pulled models once the list is older than MODEL_LIST_TTL.
+        Skipped while Ollama's breaker is open or shortly after a failed listing, so a down
+        Ollama doesn't cost a round trip per request; the last good list is kept meanwhile.
+        """
+        now = self.clock()
+        if self.listed_at is not None and now - self.listed_at < MODEL_LIST_TTL:
+            return
+        if self.list_failed_at is not None and now - self.list_failed_at < MODEL_LIST_RETRY:
+            return
+        if not self.breaker.available():
+            return
+        try:
+            self.installed = {m.model for m in ollama.list().models}
+            self.listed_at = now
+            self.list_failed_at = None
+        except Exception as e:
+            self.list_failed_at = now
+            logger.warning(f"Couldn't list Ollama models: {e}")
+
+    def has_model(self, name: str) -> bool:
+        """Whether a model is pulled locally. 'llama3' matches 'llama3:latest'."""
+        self.refresh_models()
+        if self.installed is None:
+            return False
+        return name in self.installed or f"{name}:latest" in self.installed
+
+    def use_model(self, name: str):
+        """Switches to another model if it is installed, otherwise stays on the default one."""
+        if name == self.default_model or self.has_model(name):
+            self.missing_models.discard(name)
+            self.model_name = name
+        else:
+            if name not in self.missing_models:
+                self.missing_models.add(name)
+                logger.warning(f"Ollama model {name} is not installed, using {self.default_model}.")
+            self.model_name = self.default_model
 
-    def generate(self, prompt: str, history: list) -> str:
+    def _generate(self, prompt: str, history: list) -> str:
         # Convert history to Ollama format if needed, for now just concatenating or using system prompt
         messages = [{'role': 'system', 'content': BHUMI_PERSONA}]
         messages.extend(history)
@@ -39,47 +115,54 @@ class OllamaBackend(LLMBackend):
 
         try:
             response = ollama.chat(model=self.model_name, messages=messages)
-            return response['message']['content']
-        except Exception as e:
-            logger.error(f"Ollama Error: {e}")
-            return "Opps, my local brain hurts. Check if Ollama is running, darling! 💔"
+        except ollama.ResponseError as e:
+            # A missing swapped-in model is our mistake, not Ollama being down: don't count it against the breaker
+            if e.status_code != 404 or self.model_name == self.default_model:
+                raise
+            logger.warning(f"Ollama model {self.model_name} not found, using {self.default_model}.")
+            if self.installed is not None:
+                self.installed.discard(self.model_name)
+            self.model_name = self.default_model
+            response = ollama.chat(model=self.model_name, messages=messages)
+        return response['message']['content']
 
 class GeminiBackend(LLMBackend):
+    name = "Gemini"
+    error_message = "My cloud connection is fuzzy. Did you pay the internet bill, babe? 😘"
+
     def __init__(self, api_key: str):
+        super().__init__()
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-2.0-flash') # Using Flash as Pro might not be available yet or expensive, can be changed via string
         # Note: Gemini 2.0 Pro availability varies, using 'gemini-pro' or 'gemini-1.5-pro' as stable fallback or specific 2.0 string if known.
         # User requested "Gemini 2.0 Pro". I will try to use the closest valid model name.
         # As of now, 'gemini-pro' is standard. I'll make it configurable or stick to a safe default.
 
-    def generate(self, prompt: str, history: list) -> str:
+    def _generate(self, prompt: str, history: list) -> str:
         # Gemini handles history via chat session
-        try:
-            # Construct chat history for Gemini
-            # history is expected to be list of dicts {'role': 'user'/'assistant', 'content': '...'}
-            gemini_history = []
-            for msg in history:
-                role = 'user' if msg['role'] == 'user' else 'model'
-                gemini_history.append({'role': role, 'parts': [msg['content']]})
-
-            chat = self.model.start_chat(history=gemini_history)
-
-            # Send system prompt context with the message or setup beforehand?
-            # Gemini Python SDK supports system instructions in newer versions,
-            # or we just prepend it to the first message or the current prompt.
-            # We'll prepend to the prompt for simplicity here to enforce persona.
-            full_prompt = f"{BHUMI_PERSONA}\n\nUser says: {prompt}"
-
-            response = chat.send_message(full_prompt)
-            return response.text
-        except Exception as e:
-            logger.error(f"Gemini Error: {e}")
-            return "My cloud connection is fuzzy. Did you pay the internet bill, babe? 😘"
+        # Construct chat history for Gemini
+        # history is expected to be list of dicts {'role': 'user'/'assistant', 'content': '...'}
+        gemini_history = []
+        for msg in history:
+            role = 'user' if msg['role'] == 'user' else 'model'
+            gemini_history.append({'role': role, 'parts': [msg['content']]})
+
+        chat = self.model.start_chat(history=gemini_history)
+
+        # Send system prompt context with the message or setup beforehand?
+        # Gemini Python SDK supports system instructions in newer versions,
+        # or we just prepend it to the first message or the current prompt.
+        # We'll prepend to the prompt for simplicity here to enforce persona.
+        full_prompt = f"{BHUMI_PERSONA}\n\nUser says: {prompt}"
+
+        response = chat.send_message(full_prompt)
+        return response.text
 
 class BrainManager:
     def __init__(self):
         self.mode = Config.DEFAULT_LLM_MODEL # 'ollama' or 'gemini'
         self.history = [] # List of {'role': 'user'|'assistant', 'content': str}
+        self.policy_backend = None # Backend forced by the resource policy, overrides mode while set
 
         # Initialize Backends
         self.ollama_backend = OllamaBackend(model_name=Config.OLLAMA_MODEL)
@@ -96,18 +179,37 @@ class BrainManager:
         self.mode = mode.lower()
         return f"Switched to {self.mode.upper()} mode. Ready to rock! 🎸"
 
-    def chat(self, user_input: str) -> str:
+    def apply_policy(self, decision: dict):
+        """
+        Applies a ResourcePolicy decision (backend preference and Ollama model) to the next requests.
+        A light model that isn't pulled is skipped in favour of the configured one.
+        """
+        self.policy_backend = decision.get("llm_backend")
+        if decision.get("ollama_model"):
+            self.ollama_backend.use_model(decision["ollama_model"])
+
+    def chat(self, user_input: str, prompt: str = None) -> str:
         """
         Main entry point for chat.
+        prompt: what the model actually sees, if it differs from what the user said.
         """
         backend = self.ollama_backend
-        if self.mode == 'gemini':
+        fallback = self.gemini_backend
+        if self.policy_backend == 'gemini' and self.gemini_backend:
+            # Machine is under pressure: keep inference off the local CPU
+            backend, fallback = self.gemini_backend, self.ollama_backend
+        elif self.mode == 'gemini':
             if self.gemini_backend:
-                backend = self.gemini_backend
+                backend, fallback = self.gemini_backend, self.ollama_backend
             else:
                 return "Gemini is not configured, sweetie. Using local instead."
 
-        response_text = backend.generate(user_input, self.history)
+        # Don't wait on a backend that is known to be down
+        if not backend.breaker.available() and fallback and fallback.breaker.available():
+            logger.info(f"{backend.name} is down, answering with {fallback.name}.")
+            backend = fallback
+
+        response_text = backend.generate(prompt or user_input, self.history)
 
         # Update History
         self.history.append({'role': 'user', 'content': user_input})
@@ -115,5 +217,19 @@ class BrainManager:
 
         return response_text
 
+    def chat_with_context(self, user_input: str, context: str) -> str:
+        """
+        Answers from reference text (e.g. fetched web pages).
+        The context is sent to the model but only the question and answer are kept in history.
+        """
+        if not context:
+            return self.chat(user_input)
+
+        prompt = (
+            "Answer using these web sources. Mention the source numbers you relied on.\n\n"
+            f"{context}\n\nQuestion: {user_input}"
+        )
+        return self.chat(user_input, prompt=prompt)
+
     def clear_history(self):
         self.history = []
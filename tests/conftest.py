@@ -0,0 +1,16 @@
+import pytest
+
+
+class FakeClock:
+    """A monotonic/time.time stand-in that only moves when a test sets or advances `now`."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
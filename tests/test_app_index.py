@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import time
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.app_index import AppIndex, parse_desktop_file
+from tools.system_ctrl import SystemTools
+from config import Config
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "applications")
+USER_DIR = os.path.join(FIXTURES_DIR, "user")
+SYSTEM_DIR = os.path.join(FIXTURES_DIR, "system")
+
+
+@pytest.fixture(autouse=True)
+def linux_config(monkeypatch):
+    monkeypatch.setattr(Config, 'is_windows', lambda: False)
+    monkeypatch.setattr(Config, 'is_macos', lambda: False)
+
+
+@pytest.fixture
+def index():
+    return AppIndex(dirs=[USER_DIR, SYSTEM_DIR])
+
+
+def test_parse_desktop_file():
+    entry = parse_desktop_file(os.path.join(SYSTEM_DIR, "code.desktop"))
+    assert entry.name == "Visual Studio Code"
+    # Field codes stripped, quoting respected
+    assert entry.argv == ["/usr/share/code/code", "--unity-launch"]
+    assert "Text Editor" in entry.aliases
+
+    assert parse_desktop_file(os.path.join(SYSTEM_DIR, "hidden-helper.desktop")) is None
+    assert parse_desktop_file(os.path.join(SYSTEM_DIR, "docs-link.desktop")) is None
+    assert parse_desktop_file(os.path.join(SYSTEM_DIR, "htop.desktop")) is None
+
+
+def test_find_exact_alias_and_fuzzy(index):
+    assert index.find("Terminal").name == "Terminal"
+    assert index.find("visual studio code").name == "Visual Studio Code"
+    assert index.find("web browser").name == "Firefox Web Browser"
+    assert index.find("text editor").name == "Visual Studio Code"
+    # Misheard names
+    assert index.find("fire fox").name == "Firefox Web Browser"
+    assert index.find("visual studio").name == "Visual Studio Code"
+    assert index.find("terminel").name == "Terminal"
+    assert index.find("photoshop") is None
+    assert index.find("hidden helper") is None
+    assert index.find("htop") is None
+
+
+def test_user_entries_override_system(index):
+    assert index.find("firefox").argv == ["/home/user/.local/bin/firefox-nightly"]
+
+
+def test_incremental_refresh(tmpdir):
+    apps = tmpdir.mkdir("applications")
+    apps.join("gedit.desktop").write("[Desktop Entry]\nName=Text Editor\nExec=gedit %U\nType=Application\n")
+    index = AppIndex(dirs=[str(apps)])
+    assert index.refresh()
+    assert not index.refresh()
+
+    apps.join("blender.desktop").write("[Desktop Entry]\nName=Blender\nExec=blender\nType=Application\n")
+    with patch("tools.app_index.parse_desktop_file", wraps=parse_desktop_file) as mock_parse:
+        assert index.refresh()
+    # Only the new file was read
+    mock_parse.assert_called_once_with(str(apps.join("blender.desktop")))
+    assert index.find("blender").argv == ["blender"]
+
+    apps.join("blender.desktop").remove()
+    assert index.refresh()
+    assert index.find("blender") is None
+
+
+def test_lookup_is_fast_with_thousands_of_apps(tmpdir):
+    apps = tmpdir.mkdir("applications")
+    words = ["nova", "pixel", "quantum", "stellar", "orbit", "vector", "matrix", "ember", "glacier", "harbor"]
+    for i in range(3000):
+        name = f"{words[i % 10]} {words[(i // 10) % 10]} tool {i}"
+        apps.join(f"app{i}.desktop").write(f"[Desktop Entry]\nName={name}\nExec=app{i}\nType=Application\n")
+    index = AppIndex(dirs=[str(apps)])
+    index.refresh()
+
+    # app1234 is "orbit stellar tool 1234"
+    queries = ["nova pixel tool 42", "orbit steller tool 1234", "stellar", "glacier harbor tool 2999"]
+    start = time.perf_counter()
+    for _ in range(25):
+        for query in queries:
+            index.find(query)
+    per_lookup = (time.perf_counter() - start) / (25 * len(queries))
+
+    assert index.find("orbit steller tool 1234").argv == ["app1234"]
+    assert per_lookup < 0.001
+
+
+@patch("subprocess.Popen")
+def test_open_app_launches_without_shell(mock_popen):
+    tools = SystemTools()
+    tools.app_index = AppIndex(dirs=[USER_DIR, SYSTEM_DIR])
+
+    result = tools.open_app("terminal")
+
+    assert "Opening Terminal" in result
+    args, kwargs = mock_popen.call_args
+    assert args[0] == ["gnome-terminal", "--window"]
+    assert not kwargs.get("shell")
+    # Never shares Bhumi's stdin (the CLI prompt)
+    assert kwargs["stdin"] == subprocess.DEVNULL
+
+
+def test_open_app_unknown():
+    tools = SystemTools()
+    tools.app_index = AppIndex(dirs=[SYSTEM_DIR])
+    assert "couldn't find" in tools.open_app("photoshop")
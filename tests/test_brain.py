@@ -2,10 +2,11 @@ import pytest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import ollama
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.brain_manager import BrainManager, OllamaBackend, GeminiBackend
+from models.brain_manager import BrainManager, OllamaBackend, GeminiBackend, MODEL_LIST_TTL, MODEL_LIST_RETRY
 from config import Config
 
 def test_brain_manager_init():
@@ -40,3 +41,91 @@ def test_gemini_backend_missing_key():
         brain.switch_mode("gemini")
         response = brain.chat("Hi")
         assert "Gemini is not configured" in response
+
+def test_open_circuit_falls_back_without_calling_backend():
+    with patch("config.Config.GEMINI_API_KEY", "fake_key"):
+        brain = BrainManager()
+
+    with patch("ollama.chat", side_effect=ConnectionError("refused")) as mock_chat:
+        for _ in range(Config.BREAKER_FAILURE_THRESHOLD):
+            assert "Ollama" in brain.chat("Hi")
+        assert mock_chat.call_count == Config.BREAKER_FAILURE_THRESHOLD
+
+        brain.gemini_backend._generate = MagicMock(return_value="Hello from the cloud")
+        response = brain.chat("Hi again")
+
+        # Ollama is skipped outright once its circuit is open
+        assert response == "Hello from the cloud"
+        assert mock_chat.call_count == Config.BREAKER_FAILURE_THRESHOLD
+
+def test_apply_policy_offloads_and_swaps_model():
+    with patch("config.Config.GEMINI_API_KEY", "fake_key"):
+        brain = BrainManager()
+    brain.gemini_backend._generate = MagicMock(return_value="From the cloud")
+
+    brain.ollama_backend.installed = {"llama3:latest", "llama3.2:1b"}
+    brain.ollama_backend.listed_at = brain.ollama_backend.clock()
+    brain.apply_policy({"llm_backend": "gemini", "ollama_model": "llama3.2:1b"})
+    assert brain.chat("Hi") == "From the cloud"
+    assert brain.ollama_backend.model_name == "llama3.2:1b"
+
+    brain.apply_policy({"llm_backend": None, "ollama_model": "llama3"})
+    with patch("ollama.chat") as mock_chat:
+        mock_chat.return_value = {'message': {'content': 'Local again'}}
+        assert brain.chat("Hi") == "Local again"
+        assert mock_chat.call_args.kwargs["model"] == "llama3"
+
+def test_apply_policy_skips_light_model_that_is_not_installed():
+    brain = BrainManager()
+    listing = MagicMock(models=[MagicMock(model="llama3:latest")])
+    with patch("ollama.list", return_value=listing):
+        brain.apply_policy({"llm_backend": None, "ollama_model": "llama3.2:1b"})
+    assert brain.ollama_backend.model_name == "llama3"
+
+def test_missing_light_model_falls_back_without_tripping_breaker():
+    brain = BrainManager()
+    brain.ollama_backend.model_name = "llama3.2:1b" # e.g. removed after it was listed
+
+    def chat(model, messages):
+        if model == "llama3.2:1b":
+            raise ollama.ResponseError("model 'llama3.2:1b' not found", 404)
+        return {'message': {'content': 'Hello from llama3'}}
+
+    with patch("ollama.chat", side_effect=chat):
+        for _ in range(Config.BREAKER_FAILURE_THRESHOLD + 1):
+            assert brain.chat("Hi") == "Hello from llama3"
+    assert brain.ollama_backend.model_name == "llama3"
+    assert brain.ollama_backend.breaker.available()
+
+def test_model_listing_is_cached_and_refreshed():
+    clock = MagicMock(return_value=0.0)
+    backend = OllamaBackend("llama3", clock=clock)
+
+    # Ollama down: one listing attempt, not one per request
+    with patch("ollama.list", side_effect=ConnectionError("refused")) as mock_list:
+        for _ in range(5):
+            backend.use_model("llama3.2:1b")
+        assert mock_list.call_count == 1
+    assert backend.model_name == "llama3"
+
+    # Nor while the breaker says Ollama is down, even once the retry delay has passed
+    clock.return_value = MODEL_LIST_RETRY + 1
+    for _ in range(Config.BREAKER_FAILURE_THRESHOLD):
+        backend.breaker.record_failure()
+    with patch("ollama.list") as mock_list:
+        backend.use_model("llama3.2:1b")
+        mock_list.assert_not_called()
+    backend.breaker.record_success()
+
+    # The light model gets pulled later and is picked up on the next listing
+    listing = MagicMock(models=[MagicMock(model="llama3:latest"), MagicMock(model="llama3.2:1b")])
+    with patch("ollama.list", return_value=listing) as mock_list:
+        backend.use_model("llama3.2:1b")
+        backend.use_model("llama3.2:1b")
+        assert mock_list.call_count == 1
+    assert backend.model_name == "llama3.2:1b"
+
+    clock.return_value += MODEL_LIST_TTL + 1
+    with patch("ollama.list", return_value=MagicMock(models=[MagicMock(model="llama3:latest")])):
+        backend.use_model("llama3.2:1b")
+    assert backend.model_name == "llama3"
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import MagicMock
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+
+@pytest.fixture
+def breaker(clock):
+    clock.now = 1000.0
+    return CircuitBreaker("Test", failure_threshold=2, base_cooldown=10, max_cooldown=30, clock=clock)
+
+
+def test_opens_after_threshold(breaker):
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert not breaker.available()
+
+
+def test_success_resets_failures(breaker):
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_and_exponential_cooldown(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+
+    breaker.clock.now += 10
+    assert breaker.available()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.cooldown == 20
+    breaker.clock.now += 10
+    assert not breaker.allow()
+
+    breaker.clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.cooldown == 30  # capped
+
+    breaker.clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.cooldown == 10
+
+
+def test_call_skips_function_when_open(breaker):
+    func = MagicMock(side_effect=ConnectionError("down"))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(func)
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(func)
+    assert func.call_count == 2
+    assert breaker.stats()["trips"] == 1
@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.registry import ToolRegistry, ToolFailure
+from tools.prefetch import PrefetchScheduler
+
+
+def local_ts(day, hour, minute):
+    return time.mktime((2026, 10, day, hour, minute, 0, 0, 0, -1))
+
+
+@pytest.fixture
+def registry():
+    registry = ToolRegistry()
+    registry.emails = MagicMock(return_value="2 unread emails")
+    registry.news = MagicMock(return_value="🔥 Top Tech News")
+    registry.register("check_emails", ["email"], registry.emails)
+    registry.register("fetch_tech_news", ["tech news"], registry.news)
+    return registry
+
+
+@pytest.fixture
+def scheduler(registry, tmpdir, clock):
+    clock.now = local_ts(19, 7, 55)
+    scheduler = PrefetchScheduler(registry, log_path=str(tmpdir.join("log.json")), lead_minutes=10,
+                                  min_interval=300, max_per_hour=12, min_battery=50, clock=clock)
+    registry.prefetcher = scheduler
+    # Morning briefing habit: email at 8:00 on the two previous days, news only once in the evening
+    scheduler.log = [
+        {"tool": "check_emails", "ts": local_ts(17, 8, 0)},
+        {"tool": "check_emails", "ts": local_ts(18, 8, 2)},
+        {"tool": "fetch_tech_news", "ts": local_ts(18, 20, 0)},
+    ]
+    return scheduler
+
+
+def test_predict_from_command_log(scheduler):
+    assert scheduler.predict("check_emails") == 1.0
+    assert scheduler.predict("fetch_tech_news") == 0.0
+
+
+@patch("psutil.sensors_battery", return_value=None)
+def test_tick_prefetches_and_serves_from_cache(mock_battery, scheduler, registry):
+    assert scheduler.tick() == ["check_emails"]
+    registry.emails.assert_called_once()
+
+    scheduler.clock.now += 120
+    response = registry.run(registry.plan("check my email"))
+    assert response == "2 unread emails"
+    # Served from the prefetch, no second round trip
+    registry.emails.assert_called_once()
+
+
+@patch("psutil.sensors_battery", return_value=None)
+def test_stale_cache_is_not_served(mock_battery, scheduler, registry):
+    scheduler.tick()
+    scheduler.clock.now += 600
+    registry.run(registry.plan("check my email"))
+    assert registry.emails.call_count == 2
+
+
+@patch("psutil.sensors_battery", return_value=None)
+def test_rate_limits(mock_battery, scheduler, registry):
+    scheduler.tick()
+    # Cache expired but the per-tool interval hasn't passed yet
+    scheduler.ttls = {"check_emails": 1, "fetch_tech_news": 1}
+    scheduler.clock.now += 60
+    assert scheduler.tick() == []
+
+    scheduler.clock.now += 300
+    scheduler.max_per_hour = 1
+    assert scheduler.tick() == []
+
+
+@patch("psutil.sensors_battery", return_value=None)
+def test_failures_are_not_cached(mock_battery, scheduler, registry):
+    registry.emails.return_value = ToolFailure("I couldn't check your emails. Error: timed out")
+    assert scheduler.tick() == []
+    assert scheduler.get_fresh("check_emails") is None
+
+    # A failed live call isn't cached either, so the next request tries again
+    assert "couldn't check" in registry.run(registry.plan("check my email"))
+    registry.emails.return_value = "2 unread emails"
+    assert registry.run(registry.plan("check my email")) == "2 unread emails"
+    assert registry.emails.call_count == 3
+
+
+def test_skips_on_low_battery(scheduler, registry):
+    battery = MagicMock(percent=20, power_plugged=False)
+    with patch("psutil.sensors_battery", return_value=battery):
+        assert scheduler.tick() == []
+    battery.power_plugged = True
+    with patch("psutil.sensors_battery", return_value=battery):
+        assert scheduler.tick() == ["check_emails"]
+
+
+def test_record_use_persists_log(scheduler, registry, tmpdir):
+    registry.run(registry.plan("tech news"))
+    reloaded = PrefetchScheduler(registry, log_path=str(tmpdir.join("log.json")), clock=scheduler.clock)
+    assert [entry["tool"] for entry in reloaded.log][-1] == "fetch_tech_news"
@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import MagicMock
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.registry import ToolRegistry, build_default_registry
+
+
+@pytest.fixture
+def tools():
+    sys_tools = MagicMock()
+    sys_tools.check_health.return_value = "CPU Load: 5%"
+    web_tools = MagicMock()
+    web_tools.fetch_tech_news.return_value = "🔥 Top Tech News"
+    web_tools.search_web.side_effect = lambda q: f"Results for {q}"
+    msg_tools = MagicMock()
+    msg_tools.check_emails.return_value = "No unread emails."
+    return sys_tools, web_tools, msg_tools
+
+
+def plan_names(plan):
+    return [(tool.name, fragment) for tool, fragment in plan]
+
+
+def test_plan_splits_compound_command(tools):
+    registry = build_default_registry(*tools)
+    plan = registry.plan("Check my email and tech news and system health")
+    assert plan_names(plan) == [
+        ("check_emails", "Check my email"),
+        ("fetch_tech_news", "tech news"),
+        ("check_health", "system health"),
+    ]
+
+
+def test_plan_keeps_unmatched_fragments_with_previous_tool(tools):
+    registry = build_default_registry(*tools)
+    plan = registry.plan("search salt and pepper, then check health")
+    assert plan_names(plan) == [("search_web", "search salt and pepper"), ("check_health", "check health")]
+
+
+def test_plan_repeats_input_tools(tools):
+    registry = build_default_registry(*tools)
+    plan = registry.plan("search cats and check my email and search dogs")
+    assert plan_names(plan) == [
+        ("search_web", "search cats"),
+        ("check_emails", "check my email"),
+        ("search_web", "search dogs"),
+    ]
+
+
+def test_plan_leaves_mixed_chat_to_the_brain(tools):
+    registry = build_default_registry(*tools)
+    assert registry.plan("I love rock and roll, then search guitars") == []
+    assert registry.plan("check my email and tell me a joke") == []
+
+
+def test_open_app_needs_the_verb_first_and_a_known_app(tools):
+    sys_tools = tools[0]
+    sys_tools.find_app.side_effect = lambda name: MagicMock() if name.lower() == "firefox" else None
+    registry = build_default_registry(*tools)
+
+    assert plan_names(registry.plan("Please open Firefox")) == [("open_app", "Please open Firefox")]
+    assert registry.plan("what is open source software") == []
+    assert registry.plan("tell me about open source licenses and why people use them") == []
+    assert registry.plan("when did SpaceX launch Starship") == []
+    # Verb first, but no such app: the brain answers
+    assert registry.plan("open source software is great") == []
+
+    registry.run(registry.plan("launch firefox"))
+    sys_tools.open_app.assert_called_once_with("firefox")
+
+
+def test_plan_empty_for_chat(tools):
+    registry = build_default_registry(*tools)
+    assert registry.plan("tell me a joke") == []
+
+
+def test_run_merges_results_in_order(tools):
+    sys_tools, web_tools, msg_tools = tools
+    registry = build_default_registry(*tools)
+    response = registry.run(registry.plan("tech news and search python and check my email"))
+    assert response == "🔥 Top Tech News\n\nResults for python\n\nNo unread emails."
+    web_tools.search_web.assert_called_once_with("python")
+
+
+def test_run_is_concurrent():
+    registry = ToolRegistry()
+    for name in ("one", "two", "three"):
+        registry.register(name, [name], lambda: time.sleep(0.3) or "done")
+
+    start = time.monotonic()
+    response = registry.run(registry.plan("one and two and three"))
+    elapsed = time.monotonic() - start
+
+    assert response.count("done") == 3
+    assert elapsed < 0.6
+
+
+def test_run_reports_timeouts_and_errors():
+    registry = ToolRegistry()
+    registry.register("slow", ["slow"], lambda: time.sleep(1) or "late", label="Slow tool", timeout=0.1)
+    registry.register("broken", ["broken"], lambda: 1 / 0, label="Broken tool")
+    registry.register("fast", ["fast"], lambda: "quick")
+
+    start = time.monotonic()
+    response = registry.run(registry.plan("slow and broken and fast"))
+
+    assert time.monotonic() - start < 0.5
+    assert "Slow tool is taking forever" in response
+    assert "Broken tool fell over" in response
+    assert response.endswith("quick")
+
+
+def test_deep_search_routes_through_brain(tools):
+    sys_tools, web_tools, msg_tools = tools
+    web_tools.deep_search.return_value = "[1] Page (http://x)\nSome text"
+    brain = MagicMock()
+    brain.chat_with_context.return_value = "Here's the scoop"
+
+    registry = build_default_registry(sys_tools, web_tools, msg_tools, brain)
+    plan = registry.plan("research snapdragon undervolting")
+    assert plan_names(plan) == [("deep_search", "research snapdragon undervolting")]
+
+    assert registry.run(plan) == "Here's the scoop"
+    web_tools.deep_search.assert_called_once_with("snapdragon undervolting")
+    web_tools.search_web.assert_not_called()
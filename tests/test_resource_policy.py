@@ -0,0 +1,114 @@
+import pytest
+from unittest.mock import patch
+import os
+import sys
+import time
+from collections import namedtuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.resource_policy import ResourcePolicy, FULL, REDUCED, MINIMAL
+from config import Config
+
+CpuTimes = namedtuple("CpuTimes", ["user", "system", "idle", "iowait"])
+
+
+def readings(cpu=10.0, mem_gb=16.0, on_battery=False, battery=None):
+    return {"cpu": cpu, "mem_gb": mem_gb, "on_battery": on_battery, "battery": battery}
+
+
+@pytest.fixture
+def policy(clock):
+    return ResourcePolicy(clock=clock)
+
+
+def test_idle_machine_gets_full_tier(policy):
+    decision = policy.decide(readings())
+    assert decision["tier"] == FULL
+    assert decision["ollama_model"] == Config.OLLAMA_MODEL
+    assert decision["whisper_profile"] == Config.WHISPER_PROFILE
+    assert decision["llm_backend"] is None
+
+
+def test_pressure_downgrades_immediately(policy):
+    assert policy.decide(readings(cpu=70))["tier"] == REDUCED
+    decision = policy.decide(readings(cpu=95))
+    assert decision["tier"] == MINIMAL
+    assert decision["llm_backend"] == "gemini"
+    assert decision["whisper_profile"] == "background"
+
+    policy.tier = FULL
+    assert policy.decide(readings(on_battery=True, battery=80))["tier"] == REDUCED
+    assert policy.decide(readings(on_battery=True, battery=10))["tier"] == MINIMAL
+    assert policy.decide(readings(mem_gb=1.0))["tier"] == MINIMAL
+
+
+def test_hysteresis_prevents_flapping(policy):
+    policy.decide(readings(cpu=70))
+
+    # Idle again, but the tier was only just entered
+    assert policy.decide(readings(cpu=10))["tier"] == REDUCED
+
+    policy.clock.now += Config.POLICY_MIN_DWELL + 1
+    # Just under the threshold isn't enough to move back up
+    assert policy.decide(readings(cpu=Config.POLICY_CPU_MID - 5))["tier"] == REDUCED
+    assert policy.decide(readings(cpu=10))["tier"] == FULL
+
+
+def test_metrics(policy):
+    policy.decide(readings())
+    policy.decide(readings(cpu=99))
+    metrics = policy.metrics()
+    assert metrics["decisions"] == 2
+    assert metrics["switches"] == 1
+    assert metrics["tier_counts"][MINIMAL] == 1
+    assert metrics["last_readings"]["cpu"] == 99
+
+
+@patch("psutil.sensors_battery", return_value=None)
+def test_read_uses_psutil(mock_battery, policy):
+    r = policy.read()
+    assert 0 <= r["cpu"] <= 100
+    assert r["mem_gb"] > 0
+    assert r["on_battery"] is False
+
+
+def cpu_timeline(samples, cores=8):
+    """Cumulative psutil.cpu_times() readings for consecutive 2 s samples with the given busy seconds."""
+    user, idle = 0.0, 0.0
+    times = [CpuTimes(user, 0.0, idle, 0.0)]
+    for busy in samples:
+        user += busy * cores
+        idle += (2.0 - busy) * cores
+        times.append(CpuTimes(user, 0.0, idle, 0.0))
+    return times
+
+
+@patch("psutil.sensors_battery", return_value=None)
+def test_load_spike_after_idle_gap_is_noticed(mock_battery, clock):
+    # 8 s idle, then every core pegged for the last 1.5 s, then load drops off again
+    with patch("psutil.cpu_times", side_effect=cpu_timeline([0, 0, 0, 0, 1.5, 0])):
+        policy = ResourcePolicy(clock=clock)
+        for _ in range(4):
+            policy.sample()
+        assert policy.decide()["tier"] == FULL
+
+        policy.sample()
+        decision = policy.decide()
+        assert decision["tier"] == REDUCED
+        assert policy.metrics()["last_readings"]["cpu"] == 75.0
+
+        # Drops are smoothed rather than taken at once
+        assert policy.sample() == 37.5
+
+
+def test_samples_in_background(clock):
+    policy = ResourcePolicy(clock=clock, sample_interval=0.01)
+    policy.start()
+    try:
+        deadline = time.monotonic() + 5
+        while policy.cpu is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert policy.cpu is not None
+    finally:
+        policy.stop()
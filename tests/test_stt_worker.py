@@ -0,0 +1,124 @@
+import pytest
+import os
+import sys
+import time
+import threading
+from array import array
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.stt_worker import WhisperWorker
+from tools.voice_io import WHISPER_PROFILES
+
+CRASH_SAMPLE = 12345
+
+
+class FakeSegment:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Runs inside the worker process. Describes the audio it got, or crashes on demand."""
+
+    def __init__(self, model_size, **kwargs):
+        self.model_size = model_size
+
+    def transcribe(self, audio, **kwargs):
+        if len(audio) and round(audio[0] * 32768) == CRASH_SAMPLE:
+            os._exit(1)
+        if len(audio) and round(audio[0] * 32768) == 1:
+            time.sleep(0.5)
+        peak = round(float(abs(audio).max()) * 32768) if len(audio) else 0
+        return [FakeSegment(f"{self.model_size} {len(audio)} samples peak {peak}")], None
+
+
+def broken_model(model_size, **kwargs):
+    """A model factory that always fails, like a missing or corrupt model download."""
+    raise OSError(f"cannot load {model_size}")
+
+
+def pcm(samples):
+    return array("h", samples).tobytes()
+
+
+@pytest.fixture
+def worker():
+    worker = WhisperWorker(WHISPER_PROFILES, preload=["command"], model_factory=FakeModel,
+                           max_seconds=2, health_interval=0.2, ping_timeout=2.0)
+    yield worker
+    worker.close()
+
+
+def test_transcribes_through_shared_memory(worker):
+    text = worker.transcribe(pcm([0, 100, -2000, 50] * 4000), timeout=30)
+    assert text == "tiny 16000 samples peak 2000"
+
+    text = worker.transcribe(pcm([0, 7] * 10), profile="dictation", timeout=30)
+    assert text == "base 20 samples peak 7"
+
+
+def test_caller_thread_only_blocks(worker):
+    worker.ready.wait(30)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(text=worker.transcribe(pcm([1, 5] * 100))))
+
+    start = time.monotonic()
+    thread.start()
+    # The main thread keeps running while the worker decodes
+    assert time.monotonic() - start < 0.1
+    thread.join(10)
+    assert result["text"] == "tiny 200 samples peak 5"
+
+
+def test_restarts_after_crash(worker):
+    worker.ready.wait(30)
+    with pytest.raises(RuntimeError):
+        worker.transcribe(pcm([CRASH_SAMPLE, 0]), timeout=30)
+    assert worker.restarts == 1
+
+    # The replacement warms up in its own process and then serves requests again
+    assert worker.transcribe(pcm([0, 9]), timeout=30) == "tiny 2 samples peak 9"
+
+
+def test_health_check_restarts_dead_worker(worker):
+    worker.ready.wait(30)
+    worker.process.kill()
+
+    deadline = time.monotonic() + 10
+    while worker.restarts == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert worker.restarts == 1
+    assert worker.transcribe(pcm([0, 3]), timeout=30) == "tiny 2 samples peak 3"
+
+
+def test_unknown_preload_profile_falls_back_to_command():
+    worker = WhisperWorker(WHISPER_PROFILES, preload=["fast", "command"], model_factory=FakeModel,
+                           max_seconds=2, health_interval=0.2)
+    try:
+        assert worker.preload == ["command"]
+        assert worker.transcribe(pcm([0, 4]), profile="fast", timeout=30) == "tiny 2 samples peak 4"
+    finally:
+        worker.close()
+
+
+def test_backs_off_and_gives_up_when_models_fail_to_load():
+    worker = WhisperWorker(WHISPER_PROFILES, preload=["command"], model_factory=broken_model,
+                           max_seconds=2, health_interval=0.05, max_startup_failures=3)
+    try:
+        deadline = time.monotonic() + 30
+        while not worker.gave_up and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert worker.gave_up
+        assert "cannot load tiny" in worker.last_error
+        # One retry per failure until giving up, and none afterwards
+        time.sleep(0.5)
+        assert worker.restarts == 2
+
+        # Callers get an error right away instead of waiting for a worker that will never be ready
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="failed to load"):
+            worker.transcribe(pcm([0, 1]), timeout=30)
+        assert time.monotonic() - start < 1
+    finally:
+        worker.close()
@@ -0,0 +1,153 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import wave
+import itertools
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.voice_io import VoiceIO, WHISPER_PROFILES, MAX_LOAD_FAILURES
+from tools import whisper_bench
+
+
+class FakeSegment:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeWhisperModel:
+    """Stands in for faster_whisper.WhisperModel and records how it was used."""
+    instances = []
+
+    def __init__(self, model_size, **kwargs):
+        self.model_size = model_size
+        self.kwargs = kwargs
+        self.calls = []
+        FakeWhisperModel.instances.append(self)
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        with open(os.path.splitext(audio)[0] + ".hyp", encoding="utf-8") as f:
+            return [FakeSegment(f.read())], None
+
+
+def write_wav(path, seconds=1.0, rate=16000):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\x00\x00" * int(seconds * rate))
+
+
+@pytest.fixture
+def fake_whisper():
+    FakeWhisperModel.instances = []
+    with patch("tools.voice_io.WhisperModel", FakeWhisperModel), patch("config.Config.WHISPER_WORKER", False):
+        yield FakeWhisperModel
+
+
+@pytest.fixture
+def corpus_dir(tmpdir):
+    clips = {
+        "open_browser": ("Open the browser.", "open the browser"),
+        "check_email": ("Check my email please", "check my mail please"),
+    }
+    for name, (reference, hypothesis) in clips.items():
+        write_wav(tmpdir.join(name + ".wav"), seconds=2.0)
+        tmpdir.join(name + ".txt").write(reference)
+        tmpdir.join(name + ".hyp").write(hypothesis)
+    return str(tmpdir)
+
+
+def test_word_error_rate():
+    assert whisper_bench.word_error_rate("Hello there, Bhumi!", "hello there bhumi") == 0.0
+    assert whisper_bench.word_error_rate("check my email", "check my mail") == pytest.approx(1 / 3)
+    assert whisper_bench.word_error_rate("open app", "open the app now") == 1.0
+
+
+def test_profiles_use_their_decode_settings(fake_whisper, tmpdir):
+    write_wav(tmpdir.join("clip.wav"))
+    tmpdir.join("clip.hyp").write("hi")
+
+    voice = VoiceIO(profile="command")
+    voice.transcribe(str(tmpdir.join("clip.wav")))
+    voice.transcribe(str(tmpdir.join("clip.wav")), profile="dictation")
+
+    command_model = fake_whisper.instances[0]
+    dictation_model = next(m for m in fake_whisper.instances if m.model_size == "base")
+    assert command_model.model_size == WHISPER_PROFILES["command"]["model"]
+    assert command_model.calls[0]["beam_size"] == 1
+    assert dictation_model.calls[0]["beam_size"] == 5
+
+
+def test_preloads_the_profiles_the_policy_can_pick(fake_whisper):
+    with patch("config.Config.ADAPTIVE_POLICY", True):
+        VoiceIO(profile="dictation")
+    loaded = [(m.model_size, m.kwargs["cpu_threads"]) for m in fake_whisper.instances]
+    # dictation by default, command when reduced, single-threaded background when minimal
+    assert loaded[0][0] == "base"
+    assert ("tiny", 1) in loaded
+    assert len(loaded) == 3
+
+    fake_whisper.instances = []
+    with patch("config.Config.ADAPTIVE_POLICY", False):
+        VoiceIO(profile="dictation")
+    assert len(fake_whisper.instances) == 1
+
+
+def test_failed_load_is_not_retried_on_every_call(fake_whisper, tmpdir):
+    write_wav(tmpdir.join("clip.wav"))
+    attempts = []
+
+    def broken_dictation(model_size, **kwargs):
+        if model_size == "base":
+            attempts.append(model_size)
+            raise OSError("model download failed")
+        return FakeWhisperModel(model_size, **kwargs)
+
+    with patch("tools.voice_io.WhisperModel", broken_dictation), patch("config.Config.ADAPTIVE_POLICY", False):
+        voice = VoiceIO(profile="command")
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="not loaded"):
+                voice.transcribe(str(tmpdir.join("clip.wav")), profile="dictation")
+        # Still backing off
+        assert attempts == ["base"]
+
+        # Retries once each backoff is over, then gives up for good
+        with patch("tools.voice_io.time.monotonic", side_effect=itertools.count(10 ** 9, 10 ** 6)):
+            for _ in range(MAX_LOAD_FAILURES + 2):
+                assert voice.load_whisper("dictation") is None
+        assert len(attempts) == MAX_LOAD_FAILURES
+
+
+def test_cpu_threads_override(fake_whisper):
+    with patch("config.Config.WHISPER_CPU_THREADS", 3):
+        VoiceIO(profile="command")
+    assert fake_whisper.instances[0].kwargs["cpu_threads"] == 3
+
+
+def test_benchmark_reports_rtf_and_wer(fake_whisper, corpus_dir):
+    corpus = whisper_bench.load_corpus(corpus_dir)
+    assert len(corpus) == 2
+
+    results = whisper_bench.benchmark_profiles(corpus, ["command"], voice=VoiceIO())
+    assert len(results) == 1
+    result = results[0]
+    assert result["audio_seconds"] == pytest.approx(4.0)
+    # 1 substitution across 7 reference words
+    assert result["wer"] == pytest.approx(1 / 7)
+    assert result["rtf"] >= 0.0
+    assert "command" in whisper_bench.format_report(results)
+
+
+def test_speak_skips_elevenlabs_when_circuit_open(fake_whisper):
+    voice = VoiceIO()
+    voice.elevenlabs_client = MagicMock()
+    voice.elevenlabs_client.generate.side_effect = Exception("quota exceeded")
+
+    with patch("tools.voice_io.subprocess.run"):
+        for _ in range(voice.elevenlabs_breaker.failure_threshold + 2):
+            voice.speak("hello")
+
+    assert voice.elevenlabs_client.generate.call_count == voice.elevenlabs_breaker.failure_threshold
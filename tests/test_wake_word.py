@@ -0,0 +1,97 @@
+import pytest
+import math
+import os
+import random
+import sys
+import time
+import wave
+from array import array
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.wake_word import WakeWordDetector, iter_wav_frames, listen_for_wake_word
+
+RATE = 16000
+
+
+def tone(freq, seconds, amplitude):
+    return [amplitude * math.sin(2 * math.pi * freq * i / RATE) for i in range(int(seconds * RATE))]
+
+
+def wake_word(stretch=1.0, gain=1.0):
+    """Synthetic 'wake word': low, high and mid pitched syllables."""
+    return (tone(250, 0.15 * stretch, 8000 * gain)
+            + tone(2000, 0.15 * stretch, 4000 * gain)
+            + tone(500, 0.15 * stretch, 8000 * gain))
+
+
+def other_word():
+    """A different utterance of similar length: one flat high syllable."""
+    return tone(3000, 0.45, 6000)
+
+
+def silence(seconds, rng):
+    return [rng.gauss(0, 20) for _ in range(int(seconds * RATE))]
+
+
+def write_wav(path, samples):
+    pcm = array("h", [max(-32768, min(32767, int(s))) for s in samples])
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(pcm.tobytes())
+
+
+@pytest.fixture
+def detector(tmpdir):
+    rng = random.Random(1)
+    template_dir = tmpdir.mkdir("templates")
+    write_wav(template_dir.join("hey_bhumi.wav"), silence(0.3, rng) + wake_word() + silence(0.3, rng))
+    detector = WakeWordDetector()
+    assert detector.load_templates(str(template_dir)) == 1
+    return detector
+
+
+def replay(detector, path):
+    hits = []
+    listen_for_wake_word(iter_wav_frames(str(path)), detector, lambda: hits.append(True))
+    return len(hits)
+
+
+def test_detects_wake_word_in_stream(detector, tmpdir):
+    rng = random.Random(2)
+    stream = tmpdir.join("stream.wav")
+    write_wav(stream, silence(1.0, rng) + wake_word(stretch=1.1, gain=0.6) + silence(1.0, rng))
+    assert replay(detector, stream) == 1
+
+
+def test_ignores_other_speech_and_silence(detector, tmpdir):
+    rng = random.Random(3)
+    stream = tmpdir.join("stream.wav")
+    write_wav(stream, silence(1.0, rng) + other_word() + silence(0.5, rng)
+              + tone(250, 3.0, 8000) + silence(1.0, rng))
+    assert replay(detector, stream) == 0
+
+
+def test_detects_repeated_wake_words(detector, tmpdir):
+    rng = random.Random(4)
+    stream = tmpdir.join("stream.wav")
+    write_wav(stream, silence(0.5, rng) + wake_word() + silence(1.0, rng)
+              + other_word() + silence(1.0, rng) + wake_word(stretch=0.9) + silence(0.5, rng))
+    assert replay(detector, stream) == 2
+
+
+def test_idle_frames_are_cheap(detector, tmpdir):
+    rng = random.Random(5)
+    stream = tmpdir.join("idle.wav")
+    write_wav(stream, silence(5.0, rng))
+    frames = list(iter_wav_frames(str(stream)))
+
+    start = time.perf_counter()
+    for frame in frames:
+        detector.process_frame(frame)
+    elapsed = time.perf_counter() - start
+
+    # Well under real time: 5 s of audio must not take more than a small fraction of it
+    assert elapsed < 0.25 * 5.0
@@ -0,0 +1,117 @@
+import pytest
+from unittest.mock import MagicMock, patch
+import os
+import shutil
+import sys
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.web_search import WebSearch, MainTextExtractor, build_context
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Size-capped fetches hang up early on purpose
+        pass
+
+
+@pytest.fixture
+def site(tmpdir):
+    """Serves the HTML fixtures (plus a generated huge page) from a local stand-in server."""
+    for name in os.listdir(FIXTURES_DIR):
+        shutil.copy(os.path.join(FIXTURES_DIR, name), str(tmpdir))
+    paragraph = "<p>" + "Endless filler sentence about nothing in particular. " * 20 + "</p>\n"
+    tmpdir.join("huge.html").write("<html><body>" + paragraph * 5000 + "</body></html>")
+
+    server = QuietServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(tmpdir)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def web():
+    with patch("tools.web_search.DDGS"):
+        yield WebSearch()
+
+
+def test_extractor_keeps_main_text_only():
+    extractor = MainTextExtractor(min_paragraph=20)
+    with open(os.path.join(FIXTURES_DIR, "article.html"), encoding="utf-8") as f:
+        html = f.read()
+    # Feed in small pieces, the way a download arrives
+    for i in range(0, len(html), 64):
+        extractor.feed(html[i:i + 64])
+    extractor.close()
+
+    text = "\n".join(extractor.paragraphs)
+    assert "Undervolting lowers the voltage" in text
+    assert "too aggressive & you should step back" in text
+    assert "tracking" not in text
+    assert "Navigation links" not in text
+    assert "Copyright" not in text
+    assert "Short." not in text
+
+
+def test_build_context_dedupes_and_trims():
+    shared = "The same paragraph appears on both pages and should only be sent once."
+    pages = [
+        ("A", "http://a", [shared, "Unique to page A " * 10]),
+        ("B", "http://b", [shared.upper(), "Unique to page B " * 10]),
+    ]
+    context = build_context(pages, max_chars=240)
+    assert context.count("should only be sent once") == 1
+    assert "[1] A (http://a)" in context
+    assert "[2] B (http://b)" in context
+    assert len(context) < 400
+
+
+def test_fetch_page_text_caps_size(web, site):
+    paragraphs = web.fetch_page_text(site + "/huge.html", max_bytes=64 * 1024, max_chars=10 ** 9)
+    assert paragraphs
+    assert sum(len(p) for p in paragraphs) < 64 * 1024
+
+
+def test_fetch_page_text_handles_missing_page(web, site):
+    assert web.fetch_page_text(site + "/missing.html") == []
+
+
+def test_deep_search_fetches_pages(web, site):
+    web.ddgs.text.return_value = [
+        {"title": "Undervolting guide", "href": site + "/article.html", "body": "snippet 1"},
+        {"title": "Kernel notes", "href": site + "/related.html", "body": "snippet 2"},
+        {"title": "Dead link", "href": site + "/missing.html", "body": "Fallback snippet text"},
+    ]
+    context = web.deep_search("snapdragon undervolting")
+
+    assert context.count("Undervolting lowers the voltage") == 1
+    assert "Thermal throttling" in context
+    assert "Fallback snippet text" in context
+    assert "tracking" not in context
+
+
+def test_chat_with_context_keeps_history_small():
+    from models.brain_manager import BrainManager
+    brain = BrainManager()
+    brain.ollama_backend = MagicMock()
+    brain.ollama_backend.generate.return_value = "Use a 25 mV offset [1]"
+    brain.mode = "ollama"
+
+    answer = brain.chat_with_context("how do I undervolt?", "[1] Guide (http://x)\nUndervolting lowers...")
+
+    prompt = brain.ollama_backend.generate.call_args[0][0]
+    assert "Undervolting lowers" in prompt
+    assert answer == "Use a 25 mV offset [1]"
+    assert brain.history[0] == {"role": "user", "content": "how do I undervolt?"}
@@ -0,0 +1,254 @@
+"""
+Installed application index with fuzzy lookup.
+
+Built once from the platform's launcher entries and refreshed incrementally (only new or
+modified files are re-read):
+- Linux: XDG `.desktop` files
+- macOS: `.app` bundles in /Applications and friends
+- Windows: Start Menu `.lnk` shortcuts
+
+Lookups try the exact name or alias first, then trigram candidates scored by Dice similarity
+(with a bonus for prefixes). That keeps a query well under a millisecond with thousands of
+entries and tolerates misheard names ("fire fox", "chrom"). Apps are launched directly, never through a shell.
+"""
+import os
+import re
+import time
+import shlex
+import logging
+import subprocess
+import configparser
+from collections import Counter
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Desktop Entry Exec field codes (%f, %U, ...) that we don't fill in
+FIELD_CODE_PATTERN = re.compile(r"%[fFuUdDnNickvm]")
+
+# Rescan the launcher directories at most this often (seconds) when looking apps up
+REFRESH_INTERVAL = 60
+
+
+def normalize(name):
+    """Lowercase alphanumeric words, so 'Visual Studio Code' and 'visual-studio code' compare equal."""
+    return " ".join(re.findall(r"[a-z0-9]+", name.lower()))
+
+
+def trigrams(text):
+    compact = "$" + text.replace(" ", "") + "$"
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+class AppEntry:
+    def __init__(self, name, path, argv=None, aliases=()):
+        self.name = name
+        self.path = path
+        self.argv = argv  # None means "open the file with the OS" (bundles, shortcuts)
+        self.aliases = [a for a in aliases if a]
+
+    def launch(self):
+        """Starts the app detached from Bhumi (and its console), without a shell."""
+        if self.argv:
+            return subprocess.Popen(self.argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, start_new_session=True)
+        if Config.is_windows():
+            os.startfile(self.path)
+            return None
+        return subprocess.Popen(["open", self.path], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL)
+
+    def __repr__(self):
+        return f"AppEntry({self.name!r}, {self.path!r})"
+
+
+def parse_desktop_file(path):
+    """Reads a .desktop file. Returns an AppEntry, or None for hidden, terminal or non-application entries."""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str  # keys are case-sensitive
+    try:
+        parser.read(path, encoding="utf-8")
+    except (configparser.Error, UnicodeDecodeError) as e:
+        logger.debug(f"Skipping {path}: {e}")
+        return None
+
+    if not parser.has_section("Desktop Entry"):
+        return None
+    entry = parser["Desktop Entry"]
+    if entry.get("Type", "Application") != "Application":
+        return None
+    if entry.get("NoDisplay", "false").lower() == "true" or entry.get("Hidden", "false").lower() == "true":
+        return None
+    # Console programs (htop, vim) need a terminal window we can't reliably pick for the user
+    if entry.get("Terminal", "false").lower() == "true":
+        return None
+
+    name = entry.get("Name")
+    exec_line = entry.get("Exec")
+    if not name or not exec_line:
+        return None
+
+    exec_line = FIELD_CODE_PATTERN.sub("", exec_line).replace("%%", "%")
+    try:
+        argv = shlex.split(exec_line)
+    except ValueError:
+        return None
+    if not argv:
+        return None
+
+    aliases = [entry.get("GenericName", "")]
+    aliases += [k for k in entry.get("Keywords", "").split(";")]
+    aliases.append(os.path.splitext(os.path.basename(path))[0].split(".")[-1])  # org.gnome.Terminal -> Terminal
+    return AppEntry(name, path, argv=argv, aliases=aliases)
+
+
+def default_app_dirs():
+    """Where launcher entries live on this OS."""
+    home = os.path.expanduser("~")
+    if Config.is_windows():
+        return [
+            os.path.join(os.environ.get("ProgramData", r"C:\ProgramData"), r"Microsoft\Windows\Start Menu\Programs"),
+            os.path.join(os.environ.get("APPDATA", home), r"Microsoft\Windows\Start Menu\Programs"),
+        ]
+    if Config.is_macos():
+        return ["/Applications", "/Applications/Utilities", "/System/Applications", os.path.join(home, "Applications")]
+
+    data_home = os.environ.get("XDG_DATA_HOME", os.path.join(home, ".local", "share"))
+    data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    dirs = [os.path.join(d, "applications") for d in [data_home] + data_dirs if d]
+    dirs += [
+        os.path.join(data_home, "flatpak", "exports", "share", "applications"),
+        "/var/lib/flatpak/exports/share/applications",
+        "/var/lib/snapd/desktop/applications",
+    ]
+    return dirs
+
+
+class AppIndex:
+    def __init__(self, dirs=None):
+        self.dirs = dirs if dirs is not None else default_app_dirs()
+        self.files = {}  # path -> (mtime, AppEntry or None)
+        self.entries = []
+        self.refreshed_at = 0.0
+
+        # Lookup structures, rebuilt when the file set changes
+        self.by_name = {}
+        self.by_alias = {}
+        self.grams = {}  # trigram -> list of entry ids
+        self.keys = []  # per entry: (normalized name, its trigrams)
+
+    def _scan(self, directory):
+        """Yields (path, mtime) for launcher files under a directory."""
+        if Config.is_macos():
+            try:
+                with os.scandir(directory) as it:
+                    for item in it:
+                        if item.name.endswith(".app"):
+                            yield item.path, item.stat().st_mtime
+            except OSError:
+                return
+            return
+
+        suffix = ".lnk" if Config.is_windows() else ".desktop"
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith(suffix):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.stat(path).st_mtime
+                    except OSError:
+                        continue
+
+    def _load(self, path):
+        if path.endswith(".desktop"):
+            return parse_desktop_file(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return AppEntry(name, path)
+
+    def refresh(self):
+        """Re-reads only new or modified launcher files. Returns True if anything changed."""
+        seen = {}
+        changed = False
+        for directory in self.dirs:
+            for path, mtime in self._scan(directory):
+                if path in seen:
+                    continue
+                cached = self.files.get(path)
+                if cached and cached[0] == mtime:
+                    seen[path] = cached
+                else:
+                    seen[path] = (mtime, self._load(path))
+                    changed = True
+
+        if changed or len(seen) != len(self.files):
+            self.files = seen
+            self._build()
+            changed = True
+        self.refreshed_at = time.monotonic()
+        return changed
+
+    def _build(self):
+        # Earlier directories win for duplicate names (user entries override system ones)
+        self.entries = []
+        self.by_name = {}
+        self.by_alias = {}
+        self.grams = {}
+        self.keys = []
+
+        for _, entry in self.files.values():
+            if entry is None:
+                continue
+            key = normalize(entry.name)
+            compact = key.replace(" ", "")
+            if not compact or compact in self.by_name:
+                continue
+
+            idx = len(self.entries)
+            self.entries.append(entry)
+            self.by_name[compact] = entry
+            for alias in entry.aliases:
+                self.by_alias.setdefault(normalize(alias).replace(" ", ""), entry)
+
+            grams = trigrams(key)
+            self.keys.append((compact, grams))
+            for gram in grams:
+                self.grams.setdefault(gram, []).append(idx)
+
+        logger.info(f"App index: {len(self.entries)} apps.")
+
+    def find(self, query, cutoff=0.45):
+        """Best matching AppEntry for a spoken app name, or None."""
+        if not self.refreshed_at or time.monotonic() - self.refreshed_at > REFRESH_INTERVAL:
+            self.refresh()
+
+        key = normalize(query)
+        compact = key.replace(" ", "")
+        if not compact:
+            return None
+
+        if compact in self.by_name:
+            return self.by_name[compact]
+        if compact in self.by_alias:
+            return self.by_alias[compact]
+
+        # Gather candidates from the rarest trigrams first; very common ones ("ool", "app")
+        # barely discriminate and would dominate the cost with thousands of entries
+        query_grams = trigrams(key)
+        postings = sorted((self.grams.get(gram, ()) for gram in query_grams), key=len)
+        common = max(64, len(self.entries) // 10)
+        counts = Counter()
+        for i, posting in enumerate(postings):
+            if i >= 3 and len(posting) > common:
+                break
+            counts.update(posting)
+
+        best, best_score = None, 0.0
+        for idx, _ in counts.most_common(20):
+            name, grams = self.keys[idx]
+            score = 2.0 * len(query_grams & grams) / (len(query_grams) + len(grams))
+            if name.startswith(compact):
+                score += 0.25  # "chrom" -> "chromium", "fire" -> "firefox"
+            if score > best_score:
+                best, best_score = self.entries[idx], score
+
+        return best if best_score >= cutoff else None
@@ -0,0 +1,114 @@
+"""
+Circuit breakers for external backends (ElevenLabs, Gemini, Ollama).
+
+After `failure_threshold` consecutive failures a breaker opens and callers skip the backend
+straight to their fallback, instead of paying a timeout on every request. Once the cool-down
+has passed a single half-open probe is let through: success closes the breaker, failure
+re-opens it with double the cool-down (capped at `max_cooldown`).
+"""
+import time
+import logging
+import threading
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.call when the backend is known to be down."""
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=None, base_cooldown=None, max_cooldown=None, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.BREAKER_FAILURE_THRESHOLD
+        self.base_cooldown = base_cooldown or Config.BREAKER_BASE_COOLDOWN
+        self.max_cooldown = max_cooldown or Config.BREAKER_MAX_COOLDOWN
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.trips = 0  # how many times the breaker has opened
+
+    def _probe_due(self, now):
+        if self.state == OPEN:
+            return now - self.opened_at >= self.cooldown
+        if self.state == HALF_OPEN:
+            # A probe that never reported back must not block the backend forever
+            return now - self.probe_started >= self.cooldown
+        return False
+
+    def available(self):
+        """True if a call would be let through right now. Does not change state."""
+        with self.lock:
+            return self.state == CLOSED or self._probe_due(self.clock())
+
+    def allow(self):
+        """Asks to make a call. When the cool-down is over this claims the single half-open probe."""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            now = self.clock()
+            if self._probe_due(now):
+                self.state = HALF_OPEN
+                self.probe_started = now
+                logger.info(f"{self.name} circuit half-open, probing.")
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                logger.info(f"{self.name} circuit closed, backend is back.")
+            self.state = CLOSED
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+
+    def record_failure(self):
+        with self.lock:
+            now = self.clock()
+            if self.state == HALF_OPEN:
+                # Failed probe: stay away for longer
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self._open(now)
+                return
+
+            self.failures += 1
+            if self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open(now)
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+        self.trips += 1
+        logger.warning(f"{self.name} circuit open for {self.cooldown:.0f}s after {self.failures} failure(s).")
+
+    def call(self, func, *args, **kwargs):
+        """Runs func through the breaker. Raises CircuitOpenError without calling it if the circuit is open."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self):
+        with self.lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "failures": self.failures,
+                "cooldown": self.cooldown,
+                "trips": self.trips,
+            }
@@ -10,6 +10,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 import time
 from config import Config
+from tools.registry import ToolFailure
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ class MessagingTools:
     def check_emails(self, limit=5):
         """Fetches and summarizes unread emails."""
         if not self.email_address or not self.email_password:
-            return "Email credentials are not set. I'm not a hacker, I need a password! 🔐"
+            return ToolFailure("Email credentials are not set. I'm not a hacker, I need a password! 🔐")
 
         try:
             # Connect to the server
@@ -61,7 +62,7 @@ class MessagingTools:
 
         except Exception as e:
             logger.error(f"Email error: {e}")
-            return f"I couldn't check your emails. Error: {e}"
+            return ToolFailure(f"I couldn't check your emails. Error: {e}")
 
     def send_whatsapp(self, phone_no, message):
         """
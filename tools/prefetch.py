@@ -0,0 +1,218 @@
+"""
+Predictive background prefetch for the slow tool answers (email, tech news).
+
+Every tool call is appended to a small command log. From it the scheduler learns at what
+time of day each tool tends to be used, and shortly before that time refreshes the answer
+in the background, within rate limits and only with enough battery. The registry serves
+a cached answer instantly while it is still fresh.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import wait
+
+import psutil
+from config import Config
+from tools.registry import ToolFailure
+
+logger = logging.getLogger(__name__)
+
+# Tools worth prefetching and how long (seconds) their answers stay fresh.
+# System health is left out: it is cheap to read live, and a TTL short enough to be
+# accurate would expire long before the next refresh is allowed (PREFETCH_MIN_INTERVAL).
+PREFETCH_TTLS = {
+    "check_emails": 300,
+    "fetch_tech_news": 1800,
+}
+
+# Only the last two weeks of habits count
+LOG_RETENTION_DAYS = 14
+
+
+class PrefetchScheduler:
+    def __init__(self, registry, ttls=None, log_path=None, lead_minutes=None, min_interval=None,
+                 max_per_hour=None, min_battery=None, min_probability=0.5, check_interval=60, clock=time.time):
+        self.registry = registry
+        self.ttls = ttls or PREFETCH_TTLS
+        self.log_path = log_path or Config.COMMAND_LOG_PATH
+        self.lead_minutes = lead_minutes if lead_minutes is not None else Config.PREFETCH_LEAD_MINUTES
+        self.min_interval = min_interval if min_interval is not None else Config.PREFETCH_MIN_INTERVAL
+        self.max_per_hour = max_per_hour if max_per_hour is not None else Config.PREFETCH_MAX_PER_HOUR
+        self.min_battery = min_battery if min_battery is not None else Config.PREFETCH_MIN_BATTERY
+        self.min_probability = min_probability
+        self.check_interval = check_interval
+        self.clock = clock
+
+        self.lock = threading.Lock()
+        self.cache = {}  # tool name -> (answer, fetched_at)
+        self.last_refresh = {}  # tool name -> timestamp
+        self.refresh_times = []  # timestamps of all background refreshes, for the hourly cap
+        self.log = self._load_log()
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Command log
+
+    def _load_log(self):
+        if not os.path.exists(self.log_path):
+            return []
+        try:
+            with open(self.log_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable command log: {e}")
+            return []
+
+    def _save_log(self):
+        try:
+            with open(self.log_path, "w", encoding="utf-8") as f:
+                json.dump(self.log, f)
+        except OSError as e:
+            logger.warning(f"Could not save command log: {e}")
+
+    def record_use(self, name):
+        """Logs a user-initiated tool call."""
+        if name not in self.ttls:
+            return
+        now = self.clock()
+        cutoff = now - LOG_RETENTION_DAYS * 86400
+        with self.lock:
+            self.log = [entry for entry in self.log if entry["ts"] >= cutoff]
+            self.log.append({"tool": name, "ts": now})
+            self._save_log()
+
+    # Cache
+
+    def get_fresh(self, name):
+        """Returns the cached answer if it is still within its TTL, else None."""
+        with self.lock:
+            entry = self.cache.get(name)
+        if entry and self.clock() - entry[1] < self.ttls.get(name, 0):
+            return entry[0]
+        return None
+
+    def store(self, name, answer):
+        if name in self.ttls and not isinstance(answer, ToolFailure):
+            with self.lock:
+                self.cache[name] = (answer, self.clock())
+
+    # Prediction
+
+    def predict(self, name, now=None):
+        """
+        Probability that the tool is used within the next lead window,
+        measured as the share of logged days with a use in that time-of-day window.
+        """
+        now = self.clock() if now is None else now
+        start = _minute_of_day(now)
+        end = start + self.lead_minutes
+
+        all_days = set()
+        used_days = set()
+        with self.lock:
+            entries = list(self.log)
+        for entry in entries:
+            day = time.strftime("%Y-%m-%d", time.localtime(entry["ts"]))
+            all_days.add(day)
+            if entry["tool"] != name:
+                continue
+            minute = _minute_of_day(entry["ts"])
+            if start <= minute <= end or start <= minute + 1440 <= end:
+                used_days.add(day)
+
+        if not all_days:
+            return 0.0
+        return len(used_days) / len(all_days)
+
+    # Scheduling
+
+    def power_ok(self):
+        """False when running on battery below the configured level."""
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        if battery is None or battery.power_plugged:
+            return True
+        return battery.percent >= self.min_battery
+
+    def due(self):
+        """Names of tools that should be refreshed now."""
+        now = self.clock()
+        with self.lock:
+            self.refresh_times = [t for t in self.refresh_times if now - t < 3600]
+            budget = self.max_per_hour - len(self.refresh_times)
+        if budget <= 0 or not self.power_ok():
+            return []
+
+        names = []
+        for name in self.ttls:
+            if len(names) >= budget:
+                break
+            if self.registry.get(name) is None:
+                continue
+            if now - self.last_refresh.get(name, 0) < self.min_interval:
+                continue
+            if self.get_fresh(name) is not None:
+                continue
+            if self.predict(name, now) >= self.min_probability:
+                names.append(name)
+        return names
+
+    def tick(self):
+        """Refreshes every due tool concurrently. Returns the names that were refreshed."""
+        names = self.due()
+        if not names:
+            return []
+
+        now = self.clock()
+        with self.lock:
+            for name in names:
+                self.last_refresh[name] = now
+                self.refresh_times.append(now)
+
+        futures = {}
+        for name in names:
+            tool = self.registry.get(name)
+            futures[name] = self.registry.executor.submit(tool.func)
+        wait(futures.values(), timeout=max(self.registry.get(n).timeout for n in names))
+
+        refreshed = []
+        for name, future in futures.items():
+            if not future.done():
+                logger.warning(f"Prefetch of {name} timed out.")
+            elif future.exception():
+                logger.warning(f"Prefetch of {name} failed: {future.exception()}")
+            elif isinstance(future.result(), ToolFailure):
+                logger.warning(f"Prefetch of {name} failed: {future.result()}")
+            else:
+                self.store(name, future.result())
+                refreshed.append(name)
+        if refreshed:
+            logger.info(f"Prefetched: {', '.join(refreshed)}")
+        return refreshed
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Prefetch tick failed: {e}")
+
+    def start(self):
+        """Starts the background scheduler thread and hooks into the registry."""
+        self.registry.prefetcher = self
+        self._thread = threading.Thread(target=self._run, name="bhumi-prefetch", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def _minute_of_day(ts):
+    t = time.localtime(ts)
+    return t.tm_hour * 60 + t.tm_min
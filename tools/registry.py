@@ -0,0 +1,194 @@
+"""
+Tool registry for compound commands.
+
+"Check my email and tech news and system health" is split into one invocation per tool.
+Independent tools run concurrently on a shared thread pool with per-tool timeouts, so the
+wait is the slowest tool rather than the sum, and the answers are merged into one response.
+"""
+import re
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+logger = logging.getLogger(__name__)
+
+# "open firefox", "please launch the terminal": the verb has to lead the fragment
+OPEN_APP_PATTERN = re.compile(r"^\s*(please\s+)?(open|launch)\s+", re.IGNORECASE)
+
+# Joiners between independent requests. Captured so unmatched pieces can be glued back verbatim.
+SPLIT_PATTERN = re.compile(r"(\s*(?:,|;|&|\band then\b|\bthen\b|\band\b|\balso\b)\s*)", re.IGNORECASE)
+
+
+class ToolFailure(str):
+    """
+    An answer explaining that a tool couldn't do its job ("I couldn't check your emails").
+    Reads like any other answer, but is never cached or served as a prefetched result.
+    """
+
+
+class Tool:
+    def __init__(self, name, keywords, func, label=None, timeout=15.0, takes_input=False, accepts=None):
+        self.name = name
+        # Each keyword is a phrase, a tuple of words that must all appear, or a compiled regex
+        self.keywords = keywords
+        self.func = func
+        self.label = label or name
+        self.timeout = timeout
+        self.takes_input = takes_input  # pass the utterance fragment to func (e.g. a search query)
+        self.accepts = accepts  # optional final check on a matching fragment, e.g. that the app exists
+
+    def matches(self, text):
+        for keyword in self.keywords:
+            if isinstance(keyword, re.Pattern):
+                if keyword.search(text):
+                    return True
+            elif isinstance(keyword, tuple):
+                if all(word in text for word in keyword):
+                    return True
+            elif keyword in text:
+                return True
+        return False
+
+
+class ToolRegistry:
+    def __init__(self, max_workers=8):
+        self.tools = []
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bhumi-tool")
+        # Optional PrefetchScheduler: logs usage and serves fresh background results
+        self.prefetcher = None
+
+    def register(self, name, keywords, func, **kwargs):
+        """Registers a tool. Earlier registrations win when several match the same fragment."""
+        tool = Tool(name, keywords, func, **kwargs)
+        self.tools.append(tool)
+        return tool
+
+    def get(self, name):
+        for tool in self.tools:
+            if tool.name == name:
+                return tool
+        return None
+
+    def match(self, text):
+        """Returns the first tool matching a fragment of the utterance, or None."""
+        lower_text = text.lower()
+        for tool in self.tools:
+            if tool.matches(lower_text) and (tool.accepts is None or tool.accepts(text)):
+                return tool
+        return None
+
+    def plan(self, user_input):
+        """
+        Splits an utterance into [(tool, fragment), ...].
+        Fragments that match no tool belong to the previous one if it takes input ("search salt and pepper").
+        Tools that take input may appear more than once ("search cats and search dogs").
+        Returns an empty list if any part of the utterance is left over, meaning the brain should answer.
+        """
+        pieces = SPLIT_PATTERN.split(user_input)
+        plan = []
+        separator = ""
+
+        for i, piece in enumerate(pieces):
+            if i % 2:
+                separator = piece
+                continue
+            if not piece.strip():
+                continue
+
+            tool = self.match(piece)
+            if tool and (tool.takes_input or not any(t is tool for t, _ in plan)):
+                plan.append([tool, piece.strip()])
+            elif tool:
+                continue  # asked twice for the same answer, it runs once
+            elif plan and plan[-1][0].takes_input:
+                plan[-1][1] += separator + piece
+            else:
+                # Chat around the commands ("I love rock and roll") is for the brain, not to be dropped
+                return []
+
+        return [(tool, fragment.strip()) for tool, fragment in plan]
+
+    def _call(self, tool, fragment):
+        if tool.takes_input:
+            return tool.func(fragment)
+
+        if self.prefetcher:
+            self.prefetcher.record_use(tool.name)
+            cached = self.prefetcher.get_fresh(tool.name)
+            if cached is not None:
+                logger.info(f"Serving prefetched {tool.name}")
+                return cached
+
+        result = tool.func()
+        if self.prefetcher and not isinstance(result, ToolFailure):
+            self.prefetcher.store(tool.name, result)
+        return result
+
+    def run(self, plan):
+        """
+        Runs the planned invocations concurrently and merges their answers in request order.
+        A tool that overruns its timeout is reported as skipped; its thread finishes in the background.
+        """
+        start = time.monotonic()
+        futures = [(tool, self.executor.submit(self._call, tool, fragment)) for tool, fragment in plan]
+
+        results = []
+        for tool, future in futures:
+            remaining = max(0.0, tool.timeout - (time.monotonic() - start))
+            try:
+                results.append(future.result(timeout=remaining))
+            except FuturesTimeout:
+                logger.warning(f"Tool {tool.name} timed out after {tool.timeout}s")
+                results.append(f"{tool.label} is taking forever, so I skipped it for now. ⏳")
+            except Exception as e:
+                logger.error(f"Tool {tool.name} failed: {e}")
+                results.append(f"{tool.label} fell over: {e}")
+
+        logger.info(f"Ran {len(plan)} tool(s) in {time.monotonic() - start:.2f}s")
+        return "\n\n".join(str(r) for r in results)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_default_registry(sys_tools, web_tools, msg_tools, brain=None):
+    """
+    Wires SystemTools, WebSearch and MessagingTools into a registry, in the order main.py used to check them.
+    With a brain, "deep search"/"research" fetches the result pages and has the LLM answer from them.
+    """
+    registry = ToolRegistry()
+    registry.register("compile_rom", [("compile", "rom")],
+                      lambda: sys_tools.compile_rom("haydn_build.sh"),
+                      label="ROM build", timeout=5.0)
+    registry.register("check_health", ["check health", "system health", "health check"],
+                      sys_tools.check_health,
+                      label="Health check", timeout=5.0)
+    if brain:
+        def deep_search(text):
+            query = re.sub(r"\b(deep search|research)\b", "", text, flags=re.IGNORECASE).strip()
+            return brain.chat_with_context(query, web_tools.deep_search(query))
+
+        registry.register("deep_search", ["deep search", "research"], deep_search,
+                          label="Deep search", timeout=60.0, takes_input=True)
+    registry.register("search_web", ["search"],
+                      lambda text: web_tools.search_web(text.replace("search", "").strip()),
+                      label="Web search", timeout=15.0, takes_input=True)
+    registry.register("fetch_tech_news", ["tech news"],
+                      web_tools.fetch_tech_news,
+                      label="Tech news", timeout=15.0)
+    registry.register("check_emails", ["email"],
+                      msg_tools.check_emails,
+                      label="Email", timeout=20.0)
+    registry.register("whatsapp", ["whatsapp"],
+                      lambda: "I need you to implement the detailed parsing for WhatsApp, darling. 😘",
+                      label="WhatsApp", timeout=1.0)
+    # Last, so "open my email" still goes to the email tool. Only claims "open <an installed app>",
+    # so "open source software" or "when did SpaceX launch Starship" are left to the brain.
+    def app_name(text):
+        return OPEN_APP_PATTERN.sub("", text.strip(), count=1)
+
+    registry.register("open_app", [OPEN_APP_PATTERN],
+                      lambda text: sys_tools.open_app(app_name(text)),
+                      label="App launcher", timeout=5.0, takes_input=True,
+                      accepts=lambda text: sys_tools.find_app(app_name(text)) is not None)
+    return registry
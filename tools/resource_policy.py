@@ -0,0 +1,180 @@
+"""
+Resource-aware backend selection.
+
+A small background thread samples CPU load every few seconds; before each request the policy
+combines the latest load with free memory and battery state and picks a tier. Each tier maps to an LLM backend, an Ollama model size and a Whisper profile, so
+heavy local inference backs off while the machine is busy (e.g. a ROM build) or on battery.
+
+Downgrades happen immediately. Upgrades need the readings to clear the thresholds by a margin
+and the current tier to have been held for POLICY_MIN_DWELL seconds, so decisions don't flap.
+"""
+import time
+import logging
+import threading
+
+import psutil
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+FULL = "full"
+REDUCED = "reduced"
+MINIMAL = "minimal"
+TIERS = [FULL, REDUCED, MINIMAL]
+
+# How far readings must clear a threshold before moving back up a tier
+CPU_MARGIN = 10.0  # percentage points
+MEM_MARGIN_GB = 0.5
+BATTERY_MARGIN = 5.0  # percent
+
+# Seconds between CPU samples
+SAMPLE_INTERVAL = 2.0
+
+
+def cpu_busy_percent(before, after):
+    """Share of CPU time spent busy between two psutil.cpu_times() readings."""
+    total = sum(after) - sum(before)
+    idle = (after.idle - before.idle) + (getattr(after, "iowait", 0) - getattr(before, "iowait", 0))
+    if total <= 0:
+        return 0.0
+    return max(0.0, min(100.0, 100.0 * (total - idle) / total))
+
+
+class ResourcePolicy:
+    def __init__(self, clock=time.monotonic, sample_interval=SAMPLE_INTERVAL):
+        self.clock = clock
+        self.sample_interval = sample_interval
+        self.lock = threading.Lock()
+        self.tier = FULL
+        self.changed_at = clock()
+        self.cpu = None  # smoothed CPU load
+        # Our own baseline: psutil.cpu_percent() shares one with every other caller (e.g. check_health)
+        self.cpu_times = psutil.cpu_times()
+
+        self._metrics = {
+            "decisions": 0,
+            "switches": 0,
+            "tier_counts": {tier: 0 for tier in TIERS},
+            "last_readings": {},
+        }
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """
+        Takes one CPU sample. A rise in load counts straight away, a drop is smoothed,
+        so a build that just started is noticed within one sample interval.
+        """
+        times = psutil.cpu_times()
+        cpu = cpu_busy_percent(self.cpu_times, times)
+        self.cpu_times = times
+        self.cpu = cpu if self.cpu is None or cpu > self.cpu else 0.5 * self.cpu + 0.5 * cpu
+        return self.cpu
+
+    def _run(self):
+        while not self._stop.wait(self.sample_interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"CPU sample failed: {e}")
+
+    def start(self):
+        """Starts sampling CPU load in the background."""
+        self._thread = threading.Thread(target=self._run, name="bhumi-policy", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def read(self):
+        """Current CPU load (smoothed), free memory in GB and battery state."""
+        if self.cpu is None:
+            self.sample()  # nothing sampled yet: load since the policy was created
+
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+
+        return {
+            "cpu": round(self.cpu, 1),
+            "mem_gb": round(psutil.virtual_memory().available / 1024 ** 3, 2),
+            "on_battery": bool(battery and not battery.power_plugged),
+            "battery": battery.percent if battery else None,
+        }
+
+    def tier_for(self, readings, recovering=False):
+        """Tier index the readings call for. recovering=True applies the hysteresis margins."""
+        cpu = readings["cpu"] + (CPU_MARGIN if recovering else 0)
+        mem_gb = readings["mem_gb"] - (MEM_MARGIN_GB if recovering else 0)
+        battery = readings["battery"]
+        if battery is not None and recovering:
+            battery -= BATTERY_MARGIN
+        low_battery = readings["on_battery"] and battery is not None and battery < Config.POLICY_BATTERY_LOW
+
+        if cpu >= Config.POLICY_CPU_HIGH or mem_gb < Config.POLICY_MEM_LOW_GB or low_battery:
+            return TIERS.index(MINIMAL)
+        if cpu >= Config.POLICY_CPU_MID or mem_gb < Config.POLICY_MEM_MID_GB or readings["on_battery"]:
+            return TIERS.index(REDUCED)
+        return TIERS.index(FULL)
+
+    def decide(self, readings=None):
+        """Picks the tier for the next request and returns the resulting decision."""
+        readings = readings or self.read()
+        with self.lock:
+            now = self.clock()
+            current = TIERS.index(self.tier)
+
+            target = self.tier_for(readings)
+            if target < current:
+                # Only move up once comfortably clear of the thresholds, and not too often
+                target = self.tier_for(readings, recovering=True)
+                if target >= current or now - self.changed_at < Config.POLICY_MIN_DWELL:
+                    target = current
+
+            if target != current:
+                logger.info(f"Resource policy: {self.tier} -> {TIERS[target]} ({readings})")
+                self.tier = TIERS[target]
+                self.changed_at = now
+                self._metrics["switches"] += 1
+
+            self._metrics["decisions"] += 1
+            self._metrics["tier_counts"][self.tier] += 1
+            self._metrics["last_readings"] = readings
+            decision = self.decision_for(self.tier)
+
+        logger.debug(f"Resource policy decision: {decision}")
+        return decision
+
+    @staticmethod
+    def decision_for(tier):
+        """
+        What each tier runs:
+        full: the user's backend, the configured Ollama model and Whisper profile.
+        reduced: the light Ollama model and the greedy 'command' Whisper profile.
+        minimal: offload chat to Gemini when configured, single-threaded 'background' Whisper.
+        """
+        if tier == FULL:
+            return {"tier": tier, "llm_backend": None,
+                    "ollama_model": Config.OLLAMA_MODEL, "whisper_profile": Config.WHISPER_PROFILE}
+        if tier == REDUCED:
+            return {"tier": tier, "llm_backend": None,
+                    "ollama_model": Config.OLLAMA_MODEL_LIGHT, "whisper_profile": "command"}
+        return {"tier": tier, "llm_backend": "gemini",
+                "ollama_model": Config.OLLAMA_MODEL_LIGHT, "whisper_profile": "background"}
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "tier": self.tier,
+                "decisions": self._metrics["decisions"],
+                "switches": self._metrics["switches"],
+                "tier_counts": dict(self._metrics["tier_counts"]),
+                "last_readings": dict(self._metrics["last_readings"]),
+            }
+
+
+def whisper_profiles():
+    """Every Whisper profile a decision can ask for, so they can be loaded before the machine is under pressure."""
+    return list(dict.fromkeys(ResourcePolicy.decision_for(tier)["whisper_profile"] for tier in TIERS))
@@ -0,0 +1,311 @@
+"""
+Out-of-process Whisper worker.
+
+Transcription runs in a dedicated, pre-warmed child process so long decodes don't compete
+with the hotkey listener for the GIL, and a Whisper crash can't take Bhumi down with it.
+Audio is written to a shared memory buffer and only its size goes over the request queue.
+A monitor thread pings the worker and respawns it if it dies or hangs; the replacement loads
+its models in the child, never in the foreground. If the models themselves fail to load the
+worker backs off exponentially and gives up after a few attempts instead of crash-looping.
+"""
+import time
+import queue
+import logging
+import itertools
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+def load_faster_whisper(model_size, **kwargs):
+    """Default model factory, imported lazily so only the child pays for it."""
+    from faster_whisper import WhisperModel
+    return WhisperModel(model_size, device="cpu", **kwargs)
+
+
+def _worker_main(requests, results, profiles, preload, model_factory, generation):
+    """Child process loop: load models, then serve requests until a None sentinel arrives."""
+    import numpy as np
+
+    models = {}
+    buffers = {}
+
+    def load(name):
+        settings = profiles[name]
+        key = (settings["model"], settings["compute_type"], settings["cpu_threads"], settings["num_workers"])
+        if key not in models:
+            models[key] = model_factory(settings["model"],
+                                        compute_type=settings["compute_type"],
+                                        cpu_threads=settings["cpu_threads"],
+                                        num_workers=settings["num_workers"])
+        return models[key]
+
+    try:
+        for name in preload:
+            load(name)
+    except Exception as e:
+        # Report instead of dying silently, so the parent can back off rather than crash-loop
+        results.put(("failed", generation, f"{type(e).__name__}: {e}"))
+        return
+    results.put(("ready", generation, None))
+
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+
+        kind, req_id = message[0], message[1]
+        if kind == "ping":
+            results.put(("pong", req_id, None))
+            continue
+
+        _, _, shm_name, n_samples, profile = message
+        try:
+            if shm_name not in buffers:
+                buffers[shm_name] = shared_memory.SharedMemory(name=shm_name)
+            pcm = np.frombuffer(buffers[shm_name].buf, dtype=np.int16, count=n_samples)
+            audio = pcm.astype(np.float32) / 32768.0
+            del pcm  # release the view on shared memory
+
+            segments, info = load(profile).transcribe(audio, **profiles[profile]["decode"])
+            results.put(("result", req_id, " ".join(s.text for s in segments).strip()))
+        except Exception as e:
+            results.put(("error", req_id, f"{type(e).__name__}: {e}"))
+
+
+class WhisperWorker:
+    def __init__(self, profiles, preload=("command",), model_factory=load_faster_whisper,
+                 max_seconds=60, health_interval=5.0, ping_timeout=10.0, start_timeout=300.0,
+                 max_startup_failures=5):
+        """
+        profiles: name -> settings, as in voice_io.WHISPER_PROFILES (with cpu_threads resolved).
+        preload: profiles whose models are loaded before the worker reports ready.
+            Unknown names fall back to 'command'.
+        model_factory: picklable callable(model_size, **load_kwargs) returning a Whisper-like model.
+        max_startup_failures: failed model loads in a row before the worker stops retrying.
+        """
+        self.profiles = profiles
+        self.preload = []
+        for name in preload:
+            if name not in profiles:
+                logger.warning(f"Unknown Whisper profile '{name}', using 'command'.")
+                name = "command"
+            if name not in self.preload:
+                self.preload.append(name)
+        self.model_factory = model_factory
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+        self.start_timeout = start_timeout
+        self.max_startup_failures = max_startup_failures
+
+        self.ctx = mp.get_context("spawn")
+        # One reusable buffer; requests are serialized by self.lock so it is never shared
+        self.shm = shared_memory.SharedMemory(create=True, size=max_seconds * SAMPLE_RATE * 2)
+        self.lock = threading.Lock()
+        self.state_lock = threading.Lock()
+        self.restart_lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.pending = {}  # req_id -> Future
+        self.ready = threading.Event()
+        self.generation = 0
+        self.restarts = 0
+        self.process = None
+        self._closed = threading.Event()
+
+        # Startup failure tracking: consecutive failed loads, when the next retry is allowed
+        self.startup_failures = 0
+        self.failed_generation = 0
+        self.next_spawn_at = 0.0
+        self.last_error = None
+        self.gave_up = False
+
+        self._spawn()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="whisper-monitor", daemon=True)
+        self._monitor.start()
+
+    # Process management
+
+    def _spawn(self):
+        with self.state_lock:
+            self.generation += 1
+            self.ready.clear()
+            self.spawned_at = time.monotonic()
+            # Fresh queues: a crashed child can leave the old ones in a broken state
+            self.requests = self.ctx.Queue()
+            self.results = self.ctx.Queue()
+            self.process = self.ctx.Process(
+                target=_worker_main,
+                args=(self.requests, self.results, self.profiles, self.preload, self.model_factory, self.generation),
+                name=f"whisper-worker-{self.generation}",
+                daemon=True,
+            )
+            self.process.start()
+            threading.Thread(target=self._read_results, args=(self.results, self.generation),
+                             name="whisper-results", daemon=True).start()
+        logger.info(f"Whisper worker {self.generation} starting (pid {self.process.pid}).")
+
+    def _read_results(self, results, generation):
+        while not self._closed.is_set() and generation == self.generation:
+            try:
+                kind, key, payload = results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            if kind == "ready":
+                if key == self.generation:
+                    logger.info(f"Whisper worker {key} ready.")
+                    self.startup_failures = 0
+                    self.ready.set()
+                continue
+            if kind == "failed":
+                self._startup_failed(payload, key)
+                continue
+
+            future = self.pending.pop(key, None)
+            if future is None:
+                continue
+            if kind == "error":
+                future.set_exception(RuntimeError(payload))
+            else:
+                future.set_result(payload)
+
+    def restart(self, reason, generation=None):
+        """
+        Kills the current worker (if any) and spawns a replacement in the background.
+        generation: the worker the caller saw fail; if it was already replaced, nothing happens.
+        """
+        with self.restart_lock:
+            if generation is not None and generation != self.generation:
+                return
+            logger.warning(f"Restarting Whisper worker: {reason}")
+            old = self.process
+            if old is not None and old.is_alive():
+                old.kill()
+            for req_id in list(self.pending):
+                future = self.pending.pop(req_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(RuntimeError(f"Whisper worker restarted: {reason}"))
+            self.restarts += 1
+            self._spawn()
+
+    def _startup_failed(self, error, generation):
+        """Records a failed model load (once per worker) and schedules the retry with exponential backoff."""
+        with self.restart_lock:
+            if generation != self.generation or generation == self.failed_generation:
+                return
+            self.failed_generation = generation
+            self.startup_failures += 1
+            self.last_error = error
+
+            if self.startup_failures >= self.max_startup_failures:
+                self.gave_up = True
+                logger.error(f"Whisper worker failed to load {self.startup_failures} times, giving up: {error}")
+                return
+
+            backoff = self.health_interval * 2 ** (self.startup_failures - 1)
+            self.next_spawn_at = time.monotonic() + backoff
+            logger.error(f"Whisper worker failed to load: {error}. Retrying in {backoff:.0f}s.")
+
+    def _monitor_loop(self):
+        while not self._closed.wait(self.health_interval):
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.error(f"Whisper health check failed: {e}")
+
+    def check_health(self):
+        """Restarts the worker if it died, never became ready, or stopped answering pings."""
+        if self.gave_up:
+            return
+        generation, process = self.generation, self.process
+        if not process.is_alive():
+            if self.ready.is_set():
+                self.restart(f"process exited with code {process.exitcode}", generation)
+                return
+            # Died while loading models: back off instead of respawning straight away
+            self._startup_failed(f"process exited with code {process.exitcode} while loading", generation)
+            if not self.gave_up and time.monotonic() >= self.next_spawn_at:
+                self.restart("retrying startup", generation)
+            return
+        if not self.ready.is_set():
+            if time.monotonic() - self.spawned_at > self.start_timeout:
+                self.restart("model loading timed out", generation)
+            return
+
+        # Only ping when idle; a busy worker is by definition alive
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            future = self._submit(("ping",))
+            try:
+                future.result(timeout=self.ping_timeout)
+            except (FuturesTimeout, RuntimeError):
+                self.restart("no answer to health check", generation)
+        finally:
+            self.lock.release()
+
+    # Requests
+
+    def _submit(self, message):
+        req_id = next(self.ids)
+        future = Future()
+        self.pending[req_id] = future
+        self.requests.put((message[0], req_id) + tuple(message[1:]))
+        return future
+
+    def transcribe(self, pcm, profile="command", timeout=60.0):
+        """
+        Transcribes 16 kHz mono 16-bit PCM bytes. Blocks only the calling thread.
+        Raises RuntimeError if the worker is unavailable, crashes or times out.
+        """
+        if profile not in self.profiles:
+            profile = "command"
+
+        # Wait for the worker, but fail fast if loading fails meanwhile
+        deadline = time.monotonic() + timeout
+        while not self.ready.wait(timeout=0.2):
+            if self.gave_up or self.failed_generation == self.generation:
+                raise RuntimeError(f"Whisper failed to load: {self.last_error}")
+            if time.monotonic() > deadline:
+                raise RuntimeError("Whisper worker is still warming up.")
+
+        with self.lock:
+            if len(pcm) > self.shm.size:
+                logger.warning("Audio longer than the shared buffer, truncating.")
+                pcm = pcm[:self.shm.size]
+            self.shm.buf[:len(pcm)] = pcm
+
+            generation, process = self.generation, self.process
+            future = self._submit(("transcribe", self.shm.name, len(pcm) // 2, profile))
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    return future.result(timeout=0.2)
+                except FuturesTimeout:
+                    pass
+                # Notice a crash right away instead of waiting for the next health check
+                if not process.is_alive():
+                    self.restart(f"process exited with code {process.exitcode}", generation)
+                    raise RuntimeError("Whisper worker crashed during transcription.")
+                if time.monotonic() > deadline:
+                    self.restart("transcription timed out", generation)
+                    raise RuntimeError("Transcription timed out.")
+
+    def close(self):
+        self._closed.set()
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.requests.put(None)
+                self.process.join(timeout=2)
+            finally:
+                if self.process.is_alive():
+                    self.process.kill()
+        self.shm.close()
+        self.shm.unlink()
@@ -4,6 +4,7 @@ import shutil
 import psutil
 import logging
 from config import Config
+from tools.app_index import AppIndex
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +12,7 @@ class SystemTools:
     def __init__(self):
         self.is_windows = Config.is_windows()
         self.is_macos = Config.is_macos()
+        self.app_index = None # Built on first open_app
 
     def run_command(self, command):
         """Executes a shell command and returns output."""
@@ -94,16 +96,29 @@ class SystemTools:
             logger.error(f"Failed to start build: {e}")
             return f"Failed to launch build: {e}"
 
+    def find_app(self, app_name):
+        """The installed app best matching a spoken name, or None."""
+        if self.app_index is None:
+            self.app_index = AppIndex()
+
+        app = self.app_index.find(app_name)
+        if app is None and self.app_index.refresh():
+            # Might have been installed since the last refresh
+            app = self.app_index.find(app_name)
+        return app
+
     def open_app(self, app_name):
-        """Opens an application."""
-        # Using simple system commands instead of PyAutoGUI for opening apps as it's more reliable for just launching
-        if self.is_macos:
-            return self.run_command(f"open -a '{app_name}'")
-        elif self.is_windows:
-            # Using start command
-            return self.run_command(f"start {app_name}")
-        else:
-            return "I don't know how to open apps on this OS yet."
+        """Opens an application, fuzzy-matching the spoken name against the installed apps."""
+        app = self.find_app(app_name)
+        if app is None:
+            return f"I couldn't find an app called '{app_name}'. Did you install it, or just dream about it? 🤔"
+
+        try:
+            app.launch()
+            return f"Opening {app.name}. 🚀"
+        except Exception as e:
+            logger.error(f"Failed to open {app.name}: {e}")
+            return f"Failed to open {app.name}: {e}"
 
     def get_process_list(self):
         """Optional: List top processes"""
@@ -32,13 +32,68 @@ except ImportError:
     WhisperModel = None
 
 from config import Config
+from tools.wake_word import WakeWordDetector, listen_for_wake_word, FRAME_MS
+from tools.stt_worker import WhisperWorker
+from tools.circuit_breaker import CircuitBreaker
+from tools.resource_policy import whisper_profiles
 
 logger = logging.getLogger(__name__)
 
+# Named Whisper decode profiles.
+# Top-level keys configure WhisperModel loading, 'decode' is passed straight to transcribe().
+WHISPER_PROFILES = {
+    # Short spoken commands: greedy decoding on the smallest model, no temperature fallback
+    "command": {
+        "model": "tiny",
+        "compute_type": "int8",
+        "cpu_threads": 0,
+        "num_workers": 1,
+        "decode": {
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
+            "without_timestamps": True,
+        },
+    },
+    # Longer dictation: beam search on a bigger model, slower but more accurate
+    "dictation": {
+        "model": "base",
+        "compute_type": "int8",
+        "cpu_threads": 0,
+        "num_workers": 1,
+        "decode": {
+            "beam_size": 5,
+            "condition_on_previous_text": True,
+        },
+    },
+    # Machine under load: like 'command' but on a single thread, so builds keep their cores
+    "background": {
+        "model": "tiny",
+        "compute_type": "int8",
+        "cpu_threads": 1,
+        "num_workers": 1,
+        "decode": {
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
+            "without_timestamps": True,
+        },
+    },
+}
+
+# After a failed model load, wait this long (seconds, doubling per failure) before trying again,
+# and stop trying after MAX_LOAD_FAILURES, as the worker process does
+LOAD_RETRY_BASE = 5.0
+MAX_LOAD_FAILURES = 5
+
 class VoiceIO:
-    def __init__(self):
+    def __init__(self, profile=None, use_worker=None):
         self.is_listening = False
         self.elevenlabs_client = None
+        # Skips ElevenLabs entirely while it is out of quota or unreachable
+        self.elevenlabs_breaker = CircuitBreaker("ElevenLabs")
         self.audio_format = pyaudio.paInt16 if pyaudio else None
         self.channels = 1
         self.rate = 16000
@@ -48,16 +103,26 @@ class VoiceIO:
         if Config.ELEVENLABS_API_KEY and ElevenLabs:
             self.elevenlabs_client = ElevenLabs(api_key=Config.ELEVENLABS_API_KEY)
 
-        # Initialize Whisper
-        if WhisperModel:
-             try:
-                # 'cpu' int8 for broad compatibility as requested
-                self.whisper = WhisperModel("tiny", device="cpu", compute_type="int8")
-             except Exception as e:
-                logger.error(f"Failed to load Whisper: {e}")
-                self.whisper = None
+        # Initialize Whisper with the default decode profile, plus the ones the resource policy
+        # can switch to, so a busy machine never has to load a model. Others load lazily on first use.
+        self.profile = self.profile_name(profile or Config.WHISPER_PROFILE)
+        self._whisper_models = {}
+        self._load_failures = {}  # model key -> (failures, time of the next attempt)
+        self.whisper = None
+        self.worker = None
+        preload = [self.profile]
+        if Config.ADAPTIVE_POLICY:
+            preload += [self.profile_name(name) for name in whisper_profiles()]
+        preload = list(dict.fromkeys(preload))
+
+        use_worker = Config.WHISPER_WORKER if use_worker is None else use_worker
+        if use_worker and WhisperModel:
+            # Models load inside the worker process; nothing heavy happens here
+            self.worker = WhisperWorker(self.resolved_profiles(), preload=preload)
         else:
-             self.whisper = None
+            self.whisper = self.load_whisper(self.profile)
+            for name in preload[1:]:
+                self.load_whisper(name)
 
         # Fallback TTS
         if Config.is_windows() and pyttsx3:
@@ -71,12 +136,88 @@ class VoiceIO:
         else:
             self.engine = None
 
+    def get_profile(self, name=None):
+        """Returns the settings of a decode profile, falling back to 'command'."""
+        return WHISPER_PROFILES[self.profile_name(name or self.profile)]
+
+    @staticmethod
+    def profile_name(name):
+        """The profile name to use for a requested one: itself if known, otherwise 'command'."""
+        if name not in WHISPER_PROFILES:
+            logger.warning(f"Unknown Whisper profile '{name}', using 'command'.")
+            return "command"
+        return name
+
+    def resolved_profiles(self):
+        """All profiles with the configured thread count filled in, as handed to the worker process."""
+        resolved = {}
+        for name, settings in WHISPER_PROFILES.items():
+            resolved[name] = dict(settings, cpu_threads=settings["cpu_threads"] or Config.WHISPER_CPU_THREADS)
+        return resolved
+
+    def load_whisper(self, profile=None):
+        """
+        Loads the Whisper model for a decode profile.
+        Models are cached by their load settings, so profiles sharing a model share memory.
+        Failed loads are remembered too, so callers fail fast until the retry backoff is over.
+        """
+        if not WhisperModel:
+            return None
+
+        settings = self.get_profile(profile)
+        cpu_threads = settings["cpu_threads"] or Config.WHISPER_CPU_THREADS
+        key = (settings["model"], settings["compute_type"], cpu_threads, settings["num_workers"])
+
+        if key not in self._whisper_models:
+            failures, retry_at = self._load_failures.get(key, (0, 0.0))
+            if failures >= MAX_LOAD_FAILURES or time.monotonic() < retry_at:
+                return None
+            try:
+                # 'cpu' for broad compatibility
+                self._whisper_models[key] = WhisperModel(
+                    settings["model"],
+                    device="cpu",
+                    compute_type=settings["compute_type"],
+                    cpu_threads=cpu_threads,
+                    num_workers=settings["num_workers"],
+                )
+            except Exception as e:
+                failures += 1
+                backoff = LOAD_RETRY_BASE * 2 ** (failures - 1)
+                self._load_failures[key] = (failures, time.monotonic() + backoff)
+                if failures >= MAX_LOAD_FAILURES:
+                    logger.error(f"Failed to load Whisper {settings['model']} {failures} times, giving up: {e}")
+                else:
+                    logger.error(f"Failed to load Whisper {settings['model']}: {e}. Retrying in {backoff:.0f}s.")
+                return None
+            self._load_failures.pop(key, None)
+        return self._whisper_models[key]
+
+    def transcribe(self, audio, profile=None):
+        """
+        Transcribes a WAV file path (or 16kHz float audio array) with a decode profile.
+        Raises if the model is unavailable or decoding fails.
+        """
+        model = self.load_whisper(profile)
+        if not model:
+            raise RuntimeError("Whisper not loaded.")
+
+        settings = self.get_profile(profile)
+        segments, info = model.transcribe(audio, **settings["decode"])
+        return " ".join([segment.text for segment in segments]).strip()
+
+    def close(self):
+        """Stops the Whisper worker process, if any."""
+        if self.worker:
+            self.worker.close()
+            self.worker = None
+
     def speak(self, text):
         """Synthesizes speech."""
         logger.info(f"Bhumi says: {text}")
 
-        # Try ElevenLabs first
-        if self.elevenlabs_client:
+        # Try ElevenLabs first, unless it's known to be down
+        if self.elevenlabs_client and self.elevenlabs_breaker.allow():
             try:
                 audio = self.elevenlabs_client.generate(
                     text=text,
@@ -84,8 +225,10 @@ class VoiceIO:
                     model="eleven_monolingual_v1"
                 )
                 play(audio)
+                self.elevenlabs_breaker.record_success()
                 return
             except Exception as e:
+                self.elevenlabs_breaker.record_failure()
                 logger.warning(f"ElevenLabs failed: {e}. Switching to fallback.")
 
         # Fallback
@@ -97,16 +240,15 @@ class VoiceIO:
         else:
             logger.warning("No TTS engine available.")
 
-    def record_audio_to_file(self, filename="input.wav", duration=5):
+    def record_audio(self, duration=5):
         """
-        Records audio for a fixed duration or until stop signal (mocked here as fixed duration).
+        Records audio for a fixed duration and returns raw 16 kHz mono 16-bit PCM bytes (None on failure).
         In a real hotkey scenario, we would start recording on press and stop on release.
-        For simplicity with pynput global hotkeys (which trigger once), we can listen for a set time,
-        or implement start/stop logic.
+        For simplicity with pynput global hotkeys (which trigger once), we listen for a set time.
         """
         if not pyaudio:
             logger.error("PyAudio not installed.")
-            return False
+            return None
 
         p = pyaudio.PyAudio()
         stream = p.open(format=self.audio_format,
@@ -128,19 +270,38 @@ class VoiceIO:
         stream.stop_stream()
         stream.close()
         p.terminate()
+        return b''.join(frames)
+
+    def record_audio_to_file(self, filename="input.wav", duration=5):
+        """Records audio for a fixed duration into a WAV file."""
+        pcm = self.record_audio(duration)
+        if pcm is None:
+            return False
 
         wf = wave.open(filename, 'wb')
         wf.setnchannels(self.channels)
-        wf.setsampwidth(p.get_sample_size(self.audio_format))
+        wf.setsampwidth(pyaudio.get_sample_size(self.audio_format))
         wf.setframerate(self.rate)
-        wf.writeframes(b''.join(frames))
+        wf.writeframes(pcm)
         wf.close()
         return True
 
-    def listen_chunk(self):
+    def listen_chunk(self, profile=None):
         """
         Records audio and returns text.
+        profile: Whisper decode profile name, defaults to the configured one.
         """
+        if self.worker:
+            # Audio goes to the worker process through shared memory, no temp file
+            pcm = self.record_audio(duration=5)
+            if pcm is None:
+                return "Error recording audio."
+            try:
+                return self.worker.transcribe(pcm, profile or self.profile)
+            except Exception as e:
+                logger.error(f"Transcription error: {e}")
+                return ""
+
         if not self.whisper:
             return "Whisper not loaded."
 
@@ -154,8 +315,7 @@ class VoiceIO:
 
         # Transcribe
         try:
-            segments, info = self.whisper.transcribe(filename, beam_size=5)
-            text = " ".join([segment.text for segment in segments])
+            text = self.transcribe(filename, profile)
             os.remove(filename)
             return text
         except Exception as e:
@@ -184,3 +344,56 @@ class VoiceIO:
             return listener
         except Exception as e:
             logger.error(f"Failed to bind hotkey: {e}")
+
+    def start_wake_word_listener(self, callback):
+        """
+        Starts an always-on background listener that calls callback when the wake word is heard.
+        Works headless, unlike the hotkey. Whisper only runs after a detection.
+        """
+        if not pyaudio:
+            logger.error("PyAudio not installed.")
+            return
+
+        detector = WakeWordDetector(threshold=Config.WAKE_WORD_THRESHOLD)
+        if not detector.load_templates(Config.WAKE_WORD_TEMPLATES_DIR):
+            logger.error(f"No wake word templates in {Config.WAKE_WORD_TEMPLATES_DIR}. Record a few WAVs first!")
+            return
+
+        frame_samples = self.rate * FRAME_MS // 1000
+
+        def run():
+            p = pyaudio.PyAudio()
+
+            def open_stream():
+                return p.open(format=self.audio_format,
+                              channels=self.channels,
+                              rate=self.rate,
+                              input=True,
+                              frames_per_buffer=frame_samples)
+
+            stream = [open_stream()]
+
+            def frames():
+                while True:
+                    yield stream[0].read(frame_samples, exception_on_overflow=False)
+
+            def on_detect():
+                # Release the microphone while the command is recorded
+                stream[0].close()
+                try:
+                    callback()
+                finally:
+                    stream[0] = open_stream()
+
+            try:
+                listen_for_wake_word(frames(), detector, on_detect)
+            except Exception as e:
+                logger.error(f"Wake word listener stopped: {e}")
+            finally:
+                stream[0].close()
+                p.terminate()
+
+        listener = threading.Thread(target=run, name="wake-word-listener", daemon=True)
+        listener.start()
+        logger.info(f"Wake word listener started with {len(detector.templates)} template(s).")
+        return listener
@@ -0,0 +1,191 @@
+"""
+Low-CPU wake-word detection.
+
+Audio is consumed in small frames (30 ms by default). Each frame costs one energy and
+one zero-crossing pass, which is all the detector does while the room is quiet.
+Only when a short voiced segment ends is it compared against the enrolled templates
+with DTW, and only a match wakes the full Whisper pipeline.
+
+Templates are recordings of the wake word ("Hey Bhumi") saved as 16 kHz mono WAV files.
+"""
+import os
+import math
+import wave
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+def iter_wav_frames(path, frame_samples=SAMPLE_RATE * FRAME_MS // 1000):
+    """Yields 16-bit mono PCM frames from a WAV file, so recordings can be replayed as a stream."""
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path} must be 16-bit mono PCM")
+        while True:
+            data = wf.readframes(frame_samples)
+            if len(data) < frame_samples * 2:
+                break
+            yield data
+
+
+def frame_features(frame):
+    """Returns (energy in dB, zero-crossing rate) for one 16-bit PCM frame."""
+    samples = array("h", frame)
+    if not samples:
+        return 0.0, 0.0
+    energy = sum(s * s for s in samples) / len(samples)
+    crossings = sum(1 for a, b in zip(samples, samples[1:]) if (a < 0) != (b < 0))
+    return 10 * math.log10(energy + 1.0), crossings / len(samples)
+
+
+def normalize_segment(features):
+    """Removes gain from a segment so loud and quiet utterances compare equally."""
+    mean_db = sum(db for db, _ in features) / len(features)
+    return [((db - mean_db) / 10.0, zcr * 10.0) for db, zcr in features]
+
+
+def dtw_distance(a, b):
+    """Length-normalized dynamic time warping distance between two feature sequences."""
+    inf = float("inf")
+    previous = [0.0] + [inf] * len(b)
+    for x in a:
+        current = [inf]
+        for j, y in enumerate(b, 1):
+            cost = math.hypot(x[0] - y[0], x[1] - y[1])
+            current.append(cost + min(previous[j], previous[j - 1], current[j - 1]))
+        previous = current
+    return previous[-1] / (len(a) + len(b))
+
+
+class WakeWordDetector:
+    """
+    Streaming template matcher.
+    Feed frames with process_frame(); it returns True on the frame where the wake word is detected.
+    """
+
+    def __init__(self, threshold=0.35, margin_db=12.0, min_db=35.0, hangover_frames=8, max_segment_frames=100):
+        self.threshold = threshold
+        self.margin_db = margin_db  # how far above the noise floor counts as voice
+        self.min_db = min_db  # absolute floor so digital silence doesn't make hiss look like speech
+        self.hangover_frames = hangover_frames  # trailing quiet frames that end a segment
+        self.max_segment_frames = max_segment_frames  # longer speech is never the wake word
+        self.templates = []
+        self.reset()
+
+    def reset(self):
+        """Clears the streaming state (not the templates)."""
+        self.noise_db = None
+        self.segment = []
+        self.silent_frames = 0
+        self.overflow = False
+
+    def enroll(self, frames):
+        """Adds a template from an iterable of PCM frames containing one utterance of the wake word."""
+        detector = WakeWordDetector(margin_db=self.margin_db, min_db=self.min_db,
+                                    hangover_frames=self.hangover_frames)
+        segments = [seg for seg in (detector._push(f) for f in frames) if seg]
+        tail = detector._finish()
+        if tail:
+            segments.append(tail)
+        if not segments:
+            raise ValueError("No speech found in wake word template.")
+
+        self.templates.append(normalize_segment(max(segments, key=len)))
+
+    def enroll_wav(self, path):
+        self.enroll(iter_wav_frames(path))
+
+    def load_templates(self, directory):
+        """Enrolls every WAV in a directory. Returns the number of templates loaded."""
+        if not os.path.isdir(directory):
+            return 0
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(".wav"):
+                try:
+                    self.enroll_wav(os.path.join(directory, name))
+                except (ValueError, wave.Error) as e:
+                    logger.warning(f"Skipping wake word template {name}: {e}")
+        return len(self.templates)
+
+    def process_frame(self, frame):
+        """Consumes one frame. Returns True if the wake word just ended in this frame."""
+        segment = self._push(frame)
+        return bool(segment) and self._matches(segment)
+
+    def _push(self, frame):
+        """Tracks voiced segments. Returns a finished segment's features, or None."""
+        db, zcr = frame_features(frame)
+        if self.noise_db is None:
+            self.noise_db = db
+
+        if db > max(self.noise_db + self.margin_db, self.min_db):
+            self.silent_frames = 0
+            if not self.overflow:
+                self.segment.append((db, zcr))
+                if len(self.segment) > self.max_segment_frames:
+                    # Ongoing speech or music: stop buffering until the next pause
+                    self.segment = []
+                    self.overflow = True
+            return None
+
+        # Only adapt the noise floor on quiet frames
+        self.noise_db = 0.95 * self.noise_db + 0.05 * db
+        if self.overflow:
+            self.silent_frames += 1
+            if self.silent_frames >= self.hangover_frames:
+                self.overflow = False
+                self.silent_frames = 0
+            return None
+        if not self.segment:
+            return None
+
+        self.silent_frames += 1
+        self.segment.append((db, zcr))
+        if self.silent_frames < self.hangover_frames:
+            return None
+        return self._finish()
+
+    def _finish(self):
+        # Drop the trailing quiet frames kept during the hangover
+        segment = self.segment[:len(self.segment) - self.silent_frames]
+        self.segment = []
+        self.silent_frames = 0
+        return segment
+
+    def _matches(self, segment):
+        if not self.templates:
+            return False
+
+        features = normalize_segment(segment)
+        best = float("inf")
+        for template in self.templates:
+            # Way shorter or longer than the wake word is something else; skip the DTW
+            if not 0.5 <= len(features) / len(template) <= 2.0:
+                continue
+            best = min(best, dtw_distance(features, template))
+
+        if best < self.threshold:
+            logger.info(f"Wake word detected (distance {best:.3f})")
+            return True
+        return False
+
+
+def listen_for_wake_word(frames, detector, on_detect, stop_event=None):
+    """
+    Feeds a frame stream to the detector and calls on_detect() after every detection.
+    Works the same for a live microphone generator and a replayed WAV file.
+    Returns the number of detections.
+    """
+    detections = 0
+    for frame in frames:
+        if stop_event is not None and stop_event.is_set():
+            break
+        if detector.process_frame(frame):
+            detections += 1
+            on_detect()
+            detector.reset()
+    return detections
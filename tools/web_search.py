@@ -1,14 +1,116 @@
 from duckduckgo_search import DDGS
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
+import codecs
+import re
+import time
 import logging
+from config import Config
+from tools.registry import ToolFailure
 
 logger = logging.getLogger(__name__)
 
+# Elements whose text is never part of the main content
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "iframe"}
+# Elements that start a new paragraph
+BLOCK_TAGS = {"p", "div", "li", "br", "tr", "td", "section", "article", "main", "blockquote", "pre",
+              "h1", "h2", "h3", "h4", "h5", "h6"}
+
+
+class MainTextExtractor(HTMLParser):
+    """
+    Streaming main-text extractor.
+    Fed chunk by chunk as the page downloads; keeps only paragraphs of prose, never builds a DOM,
+    and sets `full` once it has enough text so the download can stop early.
+    """
+
+    def __init__(self, max_chars=20000, min_paragraph=40):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.min_paragraph = min_paragraph
+        self.paragraphs = []
+        self.chars = 0
+        self.skip_depth = 0
+        self.buffer = []
+
+    @property
+    def full(self):
+        return self.chars >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        text = " ".join("".join(self.buffer).split())
+        self.buffer = []
+        if len(text) >= self.min_paragraph and not self.full:
+            self.paragraphs.append(text)
+            self.chars += len(text)
+
+
+def build_context(pages, max_chars):
+    """
+    Merges [(title, url, paragraphs), ...] into one trimmed, deduplicated context string.
+    Each page gets an equal share of the budget; paragraphs already seen on another page are dropped.
+    """
+    pages = [page for page in pages if page[2]]
+    if not pages:
+        return ""
+
+    seen = set()
+    share = max_chars // len(pages)
+    sections = []
+    for i, (title, url, paragraphs) in enumerate(pages, 1):
+        kept = []
+        used = 0
+        for paragraph in paragraphs:
+            key = re.sub(r"\W+", " ", paragraph.lower()).strip()
+            if key in seen:
+                continue
+            seen.add(key)
+            if used + len(paragraph) > share:
+                remaining = share - used
+                if remaining > 80:
+                    kept.append(paragraph[:remaining].rsplit(" ", 1)[0] + "…")
+                break
+            kept.append(paragraph)
+            used += len(paragraph)
+        if kept:
+            sections.append(f"[{i}] {title} ({url})\n" + "\n".join(kept))
+    return "\n\n".join(sections)
+
+
 class WebSearch:
     def __init__(self):
         self.ddgs = DDGS()
 
+        # Pooled keep-alive connections for page fetches
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=Config.DEEP_SEARCH_PAGES, pool_maxsize=Config.DEEP_SEARCH_PAGES)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (compatible; Bhumi/1.0)"
+
     def search_web(self, query, max_results=3):
         """Searches the web using DuckDuckGo."""
         try:
@@ -24,6 +126,60 @@ class WebSearch:
             logger.error(f"Search error: {e}")
             return f"I tripped over a network cable while searching. Error: {e}"
 
+    def fetch_page_text(self, url, max_bytes=None, timeout=None, max_chars=None):
+        """
+        Downloads a page with a size cap and deadline, extracting paragraphs as the bytes arrive.
+        Returns a list of paragraphs (empty on any failure or non-HTML content).
+        """
+        max_bytes = max_bytes or Config.DEEP_SEARCH_MAX_BYTES
+        timeout = timeout or Config.DEEP_SEARCH_TIMEOUT
+        extractor = MainTextExtractor(max_chars=max_chars or Config.DEEP_SEARCH_CONTEXT_CHARS)
+        deadline = time.monotonic() + timeout
+
+        try:
+            with self.session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "")
+                if "html" not in content_type:
+                    return []
+
+                encoding = response.encoding if "charset" in content_type.lower() else "utf-8"
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+                received = 0
+                for chunk in response.iter_content(chunk_size=16384):
+                    received += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                    if extractor.full or received >= max_bytes or time.monotonic() > deadline:
+                        break
+                extractor.close()
+        except Exception as e:
+            logger.warning(f"Skipping {url}: {e}")
+            return []
+
+        return extractor.paragraphs
+
+    def deep_search(self, query, max_pages=None):
+        """
+        Searches, then fetches the top result pages concurrently and returns their main text
+        as a trimmed, deduplicated context for the LLM. Falls back to snippets if pages fail.
+        """
+        max_pages = max_pages or Config.DEEP_SEARCH_PAGES
+        try:
+            results = list(self.ddgs.text(query, max_results=max_pages))
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            return ""
+        if not results:
+            return ""
+
+        with ThreadPoolExecutor(max_workers=len(results)) as pool:
+            texts = list(pool.map(lambda res: self.fetch_page_text(res['href']), results))
+
+        pages = []
+        for res, paragraphs in zip(results, texts):
+            pages.append((res['title'], res['href'], paragraphs or [res['body']]))
+        return build_context(pages, Config.DEEP_SEARCH_CONTEXT_CHARS)
+
     def fetch_tech_news(self):
         """Fetches top tech stories (e.g. from Hacker News or similar)."""
         # Using Hacker News API for reliability over scraping raw HTML if possible,
@@ -50,4 +206,4 @@ class WebSearch:
 
         except Exception as e:
             logger.error(f"News fetch error: {e}")
-            return "I couldn't fetch the news. Maybe big tech is censoring me? 😜"
+            return ToolFailure("I couldn't fetch the news. Maybe big tech is censoring me? 😜")
@@ -0,0 +1,147 @@
+"""
+Offline benchmark for the Whisper decode profiles.
+
+Runs a corpus of WAV fixtures through each profile and reports
+real-time factor (decode time / audio time) and word error rate.
+
+Corpus layout: every `clip.wav` needs a `clip.txt` next to it holding the reference transcript.
+
+Usage:
+    python -m tools.whisper_bench path/to/corpus [--profiles command dictation]
+"""
+import os
+import re
+import sys
+import time
+import wave
+import argparse
+import logging
+
+from tools.voice_io import VoiceIO, WHISPER_PROFILES
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_words(text):
+    """Lowercases and strips punctuation so WER only counts real word differences."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_edit_distance(reference, hypothesis):
+    """Levenshtein distance over word lists."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,  # deletion
+                current[j - 1] + 1,  # insertion
+                previous[j - 1] + (ref_word != hyp_word),  # substitution
+            ))
+        previous = current
+    return previous[-1]
+
+
+def word_error_rate(reference, hypothesis):
+    """Word error rate of a single hypothesis against its reference transcript."""
+    ref_words = normalize_words(reference)
+    hyp_words = normalize_words(hypothesis)
+    if not ref_words:
+        return 0.0 if not hyp_words else 1.0
+    return word_edit_distance(ref_words, hyp_words) / len(ref_words)
+
+
+def wav_duration(path):
+    """Length of a WAV file in seconds."""
+    with wave.open(path, "rb") as wf:
+        return wf.getnframes() / float(wf.getframerate())
+
+
+def load_corpus(directory):
+    """Returns a sorted list of (wav_path, reference_text) pairs."""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".wav"):
+            continue
+        wav_path = os.path.join(directory, name)
+        txt_path = os.path.splitext(wav_path)[0] + ".txt"
+        if not os.path.exists(txt_path):
+            logger.warning(f"Skipping {name}: no reference transcript.")
+            continue
+        with open(txt_path, encoding="utf-8") as f:
+            corpus.append((wav_path, f.read().strip()))
+    return corpus
+
+
+def benchmark_profiles(corpus, profiles=None, voice=None):
+    """
+    Transcribes the corpus with each profile.
+    Model loading is done before timing, so RTF reflects decoding only.
+    Returns one result dict per profile.
+    """
+    # In-process models, so timings aren't skewed by the worker round trip
+    voice = voice or VoiceIO(use_worker=False)
+    profiles = profiles or list(WHISPER_PROFILES)
+    results = []
+
+    for profile in profiles:
+        if not voice.load_whisper(profile):
+            logger.error(f"Skipping profile '{profile}': Whisper not loaded.")
+            continue
+
+        audio_seconds = 0.0
+        decode_seconds = 0.0
+        errors = 0
+        ref_words = 0
+
+        for wav_path, reference in corpus:
+            audio_seconds += wav_duration(wav_path)
+            start = time.perf_counter()
+            hypothesis = voice.transcribe(wav_path, profile)
+            decode_seconds += time.perf_counter() - start
+
+            ref = normalize_words(reference)
+            errors += word_edit_distance(ref, normalize_words(hypothesis))
+            ref_words += len(ref)
+
+        results.append({
+            "profile": profile,
+            "files": len(corpus),
+            "audio_seconds": audio_seconds,
+            "decode_seconds": decode_seconds,
+            "rtf": decode_seconds / audio_seconds if audio_seconds else 0.0,
+            "wer": errors / ref_words if ref_words else 0.0,
+        })
+
+    return results
+
+
+def format_report(results):
+    """Renders benchmark results as a plain text table."""
+    lines = [f"{'profile':<12}{'files':>6}{'audio s':>10}{'decode s':>10}{'RTF':>8}{'WER':>8}"]
+    for r in results:
+        lines.append(
+            f"{r['profile']:<12}{r['files']:>6}{r['audio_seconds']:>10.2f}"
+            f"{r['decode_seconds']:>10.2f}{r['rtf']:>8.3f}{r['wer']:>8.1%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Whisper decode profiles.")
+    parser.add_argument("corpus", help="Directory of .wav files with matching .txt transcripts")
+    parser.add_argument("--profiles", nargs="+", choices=list(WHISPER_PROFILES),
+                        help="Profiles to run (default: all)")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"No WAV/transcript pairs found in {args.corpus}")
+        return 1
+
+    print(format_report(benchmark_profiles(corpus, args.profiles)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())